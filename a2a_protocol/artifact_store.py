@@ -0,0 +1,221 @@
+"""
+A2A 아티팩트 저장소 모듈
+작업에 첨부된 파일(이미지, 오디오, 동영상 등)을 디스크에 저장하고 조회합니다.
+업로드와 다운로드 모두 청크 단위로 처리하여 파일 전체를 메모리에 올리지 않습니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+from a2a_protocol.models import Artifact, MessageType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+ARTIFACT_ID_PATTERN = re.compile(r"^art_[0-9a-f]{16}$")
+
+
+class ArtifactTooLargeError(Exception):
+    """업로드한 파일이 최대 크기를 넘은 경우 발생하는 예외"""
+
+
+def artifact_type_for(content_type: Optional[str]) -> MessageType:
+    """Content-Type에 맞는 메시지 유형 (image/*, audio/*, video/*, 그 외 file)"""
+    major = (content_type or "").split("/")[0].strip().lower()
+    if major in (MessageType.IMAGE.value, MessageType.AUDIO.value, MessageType.VIDEO.value):
+        return MessageType(major)
+    return MessageType.FILE
+
+
+def guess_content_type(name: str) -> str:
+    """파일 이름으로 Content-Type 추정"""
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더의 단일 바이트 범위를 (시작, 끝) 위치로 변환
+
+    지원하지 않는 형식(여러 범위 등)이면 None을 반환하여 전체 파일을 보내고,
+    파일 범위를 벗어나면 ValueError가 발생한다.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_text, _, end_text = ranges.strip().partition("-")
+    try:
+        if not start_text:
+            # bytes=-N: 마지막 N바이트
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError(f"잘못된 범위: {range_header}")
+            return max(0, size - length), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        raise ValueError(f"잘못된 범위: {range_header}")
+
+    if start >= size or end < start:
+        raise ValueError(f"파일 범위를 벗어났습니다: {range_header}")
+    return start, min(end, size - 1)
+
+
+async def iter_file(
+    path: str, start: int = 0, end: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """파일의 start~end(포함) 구간을 청크 단위로 읽기 (파일 읽기는 스레드에서 실행)"""
+    file = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(file.seek, start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = await asyncio.to_thread(file.read, chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+class ArtifactStore:
+    """작업별 아티팩트를 디렉터리에 보관하는 저장소
+
+    파일 본문은 {작업 디렉터리}/{아티팩트 ID}에, 메타데이터(Artifact)는 같은 이름의 .json 파일에 저장한다.
+    업로드는 임시 파일에 기록한 뒤 완료되면 이름을 바꾸므로, 중간에 실패한 업로드는 조회되지 않는다.
+    """
+
+    def __init__(self, directory: str, max_size: int = 50 * 1024 * 1024, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        # 업로드/다운로드 통계
+        self.uploads = 0
+        self.uploaded_bytes = 0
+        self.rejected_uploads = 0
+        self.downloads = 0
+
+    def _task_dir(self, task_id: str) -> str:
+        """작업 디렉터리 (작업 ID를 그대로 경로에 쓰지 않도록 해시 사용)"""
+        return os.path.join(self.directory, hashlib.sha256(task_id.encode("utf-8")).hexdigest()[:32])
+
+    def _paths(self, task_id: str, artifact_id: str) -> Tuple[str, str]:
+        """아티팩트 본문과 메타데이터 파일 경로"""
+        data_path = os.path.join(self._task_dir(task_id), artifact_id)
+        return data_path, f"{data_path}.json"
+
+    async def save_stream(
+        self,
+        task_id: str,
+        chunks: AsyncIterator[bytes],
+        name: str,
+        content_type: Optional[str] = None,
+        artifact_type: Optional[MessageType] = None,
+    ) -> Artifact:
+        """청크 스트림을 파일로 저장하고 Artifact 반환 (max_size를 넘으면 ArtifactTooLargeError)"""
+        artifact_id = f"art_{uuid.uuid4().hex[:16]}"
+        content_type = content_type or guess_content_type(name)
+        data_path, meta_path = self._paths(task_id, artifact_id)
+        temp_path = f"{data_path}.part"
+
+        await asyncio.to_thread(os.makedirs, self._task_dir(task_id), exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        file = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > self.max_size:
+                    self.rejected_uploads += 1
+                    raise ArtifactTooLargeError(f"파일이 최대 크기({self.max_size}바이트)를 넘었습니다")
+                digest.update(chunk)
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, temp_path, data_path)
+        except BaseException:
+            # 실패한 업로드의 임시 파일 정리
+            await asyncio.to_thread(file.close)
+            if os.path.exists(temp_path):
+                await asyncio.to_thread(os.remove, temp_path)
+            raise
+
+        artifact = Artifact(
+            id=artifact_id,
+            type=(artifact_type or artifact_type_for(content_type)).value,
+            content={"name": name, "content_type": content_type, "size": size, "sha256": digest.hexdigest()},
+            created_at=datetime.now(timezone.utc),
+            metadata={"task_id": task_id},
+        )
+        await asyncio.to_thread(self._write_metadata, meta_path, artifact)
+
+        self.uploads += 1
+        self.uploaded_bytes += size
+        return artifact
+
+    @staticmethod
+    def _write_metadata(meta_path: str, artifact: Artifact):
+        with open(meta_path, "w", encoding="utf-8") as f:
+            f.write(artifact.model_dump_json())
+
+    def get(self, task_id: str, artifact_id: str) -> Optional[Artifact]:
+        """아티팩트 메타데이터 조회 (없으면 None)"""
+        if not ARTIFACT_ID_PATTERN.match(artifact_id):
+            return None
+
+        _, meta_path = self._paths(task_id, artifact_id)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return Artifact.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def path(self, task_id: str, artifact_id: str) -> str:
+        """아티팩트 본문 파일 경로"""
+        return self._paths(task_id, artifact_id)[0]
+
+    def list(self, task_id: str) -> List[Artifact]:
+        """작업의 아티팩트 목록 (생성 시각 순)"""
+        task_dir = self._task_dir(task_id)
+        if not os.path.isdir(task_dir):
+            return []
+
+        artifacts = []
+        for filename in os.listdir(task_dir):
+            if filename.endswith(".json"):
+                artifact = self.get(task_id, filename[:-len(".json")])
+                if artifact is not None:
+                    artifacts.append(artifact)
+        return sorted(artifacts, key=lambda artifact: artifact.created_at)
+
+    def delete_task(self, task_id: str):
+        """작업의 아티팩트 모두 삭제"""
+        task_dir = self._task_dir(task_id)
+        if os.path.isdir(task_dir):
+            shutil.rmtree(task_dir, ignore_errors=True)
+            logger.info(f"작업 {task_id}의 아티팩트를 삭제했습니다")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """업로드/다운로드 통계"""
+        return {
+            "directory": self.directory,
+            "max_size": self.max_size,
+            "uploads": self.uploads,
+            "uploaded_bytes": self.uploaded_bytes,
+            "rejected_uploads": self.rejected_uploads,
+            "downloads": self.downloads,
+        }
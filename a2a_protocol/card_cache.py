@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import time
+import traceback
+from typing import Dict, Any, Optional, Tuple
+
+from a2a_protocol.models import AgentCard
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCardCache:
+    """에이전트 URL별 AgentCard와 ETag를 파일에 저장하는 캐시"""
+
+    def __init__(self, path: str, ttl: float = 3600.0):
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """캐시 파일 로드 (없거나 손상된 경우 빈 캐시)"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            traceback.print_exc()
+            logger.warning(f"에이전트 카드 캐시를 읽을 수 없습니다: {str(e)}")
+            return {}
+
+    def _save(self):
+        """캐시 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            traceback.print_exc()
+            logger.warning(f"에이전트 카드 캐시를 저장할 수 없습니다: {str(e)}")
+
+    def get(self, agent_url: str, allow_stale: bool = False) -> Optional[Tuple[AgentCard, Optional[str]]]:
+        """캐시된 (AgentCard, ETag) 반환 (TTL이 지난 항목은 allow_stale일 때만 반환)"""
+        entry = self.entries.get(agent_url)
+        if entry is None:
+            return None
+
+        if not allow_stale and time.time() - entry["fetched_at"] > self.ttl:
+            return None
+
+        return AgentCard.model_validate(entry["card"]), entry.get("etag")
+
+    def put(self, agent_url: str, agent_card: AgentCard, etag: Optional[str] = None):
+        """AgentCard 저장"""
+        self.entries[agent_url] = {
+            "card": agent_card.model_dump(mode="json"),
+            "etag": etag,
+            "fetched_at": time.time(),
+        }
+        self._save()
+
+    def touch(self, agent_url: str):
+        """재검증(304)된 항목의 갱신 시각 연장"""
+        entry = self.entries.get(agent_url)
+        if entry is not None:
+            entry["fetched_at"] = time.time()
+            self._save()
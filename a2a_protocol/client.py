@@ -1,66 +1,507 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import random
+import secrets
+import time
 import traceback
 import uuid
-from typing import Dict, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Hashable, Tuple, TypeVar, Union
 
 import httpx
 
-from a2a_protocol.models import Task, Message, MessageType, AgentCard
+from a2a_protocol import codec, compression
+from a2a_protocol.artifact_store import guess_content_type, iter_file
+from a2a_protocol.card_cache import AgentCardCache
+from a2a_protocol.models import Task, Message, MessageType, AgentCard, TaskEvent, TaskBatchResult, TaskStatusBatch, Artifact
+from a2a_protocol.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도할 수 있는 일시적 오류 응답 (멱등성 키를 보내는 요청만 재시도)
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
 
 
 class A2AClient:
     """A2A 프로토콜을 사용하여 다른 에이전트와 통신하는 클라이언트"""
 
-    def __init__(self, agent_id: str, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        agent_id: str,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        long_poll_wait: float = 10.0,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        min_timeout: float = 1.0,
+        card_cache: Optional[AgentCardCache] = None,
+        hedge_reads: bool = False,
+        max_tracked_tasks: int = 10000,
+        max_retries: int = 2,
+        retry_backoff: float = 0.2,
+        max_retry_delay: float = 5.0,
+    ):
         self.agent_id = agent_id
         self.base_url = base_url
         self.registered_agents: Dict[str, AgentCard] = {}
 
+        # 에이전트 카드 파일 캐시 (재시작 시 즉시 사용, ETag로 재검증)
+        self.card_cache = card_cache
+
+        # 에이전트 ID별 복제본 엔드포인트와 엔드포인트별 진행 중인 요청 수
+        # (long-poll은 서버에서 대기만 하므로 부하로 세지 않고 따로 집계)
+        self.agent_endpoints: Dict[str, List[str]] = {}
+        self._outstanding: Dict[str, int] = {}
+        self._long_polls: Dict[str, int] = {}
+
+        # 작업을 생성한 복제본 (작업 상태는 복제본마다 따로 저장되므로 같은 곳으로 보냄)
+        self.max_tracked_tasks = max_tracked_tasks
+        self._task_endpoints: "OrderedDict[str, str]" = OrderedDict()
+
+        # 조회 요청 헤지 (p95 응답 시간을 넘기면 다른 복제본에 한 번 더 요청)
+        self.hedge_reads = hedge_reads
+        self.hedged_requests = 0
+
+        # HTTP 연결 풀 설정 (에이전트 base_url 별로 하나의 클라이언트 공유)
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and self._http2_available()
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+
+        # 콜백을 기다리는 위임 작업 (task_id -> 결과 Future)와 위임별 콜백 토큰
+        self._pending_callbacks: Dict[str, asyncio.Future] = {}
+        self._callback_tokens: Dict[str, str] = {}
+
+        # 마지막으로 확인한 작업 버전 (long-poll 조회에 사용)
+        self.long_poll_wait = long_poll_wait
+        self._task_versions: "OrderedDict[str, int]" = OrderedDict()
+
+        # 마지막으로 조회한 작업 사본 (이후에는 새 메시지만 받아 병합)
+        self._task_cache: "OrderedDict[str, Task]" = OrderedDict()
+
+        # 에이전트(base_url)별 회로 차단기와 (base_url, 요청 종류)별 응답 시간 기반 타임아웃
+        # (조회와 작업 생성/메시지 전송, 아티팩트 전송은 응답 시간 분포가 달라 따로 추적)
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.min_timeout = min_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+
+        # 작업 생성/메시지 전송 재시도 (Idempotency-Key로 서버에서 중복 처리 방지)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.retried_requests = 0
+
+        # 동일한 조회 요청의 진행 중인 작업 (요청 키 -> 공유 asyncio.Task)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced_requests = 0
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """HTTP/2 지원 패키지(h2) 설치 여부 확인"""
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("h2 패키지가 설치되지 않아 HTTP/1.1을 사용합니다")
+            return False
+
+    def _get_http_client(self, base_url: str) -> httpx.AsyncClient:
+        """base_url에 해당하는 공유 HTTP 클라이언트 반환 (없으면 생성)"""
+        client = self._http_clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                # msgpack을 사용할 수 있으면 우선 요청 (서버가 지원하지 않으면 JSON)
+                # 큰 작업 응답은 압축해서 받음 (zstandard가 있으면 zstd, 없으면 gzip)
+                headers={"Accept": codec.accept_header(), "Accept-Encoding": compression.accept_encoding_header()},
+            )
+            self._http_clients[base_url] = client
+        return client
+
+    def _get_breaker(self, base_url: str) -> CircuitBreaker:
+        """base_url에 해당하는 회로 차단기 반환 (없으면 생성)"""
+        breaker = self._breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            self._breakers[base_url] = breaker
+        return breaker
+
+    def _get_latency(self, base_url: str, operation: str = "read") -> LatencyTracker:
+        """base_url과 요청 종류에 해당하는 응답 시간 추적기 반환 (없으면 생성)"""
+        key = (base_url, operation)
+        latency = self._latencies.get(key)
+        if latency is None:
+            latency = LatencyTracker(min_timeout=self.min_timeout, max_timeout=self.timeout)
+            self._latencies[key] = latency
+        return latency
+
+    @staticmethod
+    def _operation(method: str) -> str:
+        """HTTP 메서드의 요청 종류 (조회는 read, 그 외는 write)"""
+        return "read" if method in ("GET", "HEAD") else "write"
+
+    async def _request(
+        self,
+        method: str,
+        base_url: str,
+        url: str,
+        wait: float = 0.0,
+        long_poll: bool = False,
+        operation: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        """회로 차단기와 적응형 타임아웃을 적용하여 HTTP 요청 전송
+
+        wait은 서버 측 대기(long-poll) 시간으로, 타임아웃에 더해지고 응답 시간 통계에서는 제외된다.
+        long_poll 요청은 엔드포인트 선택에 쓰는 진행 중인 요청 수에 포함하지 않는다.
+        operation(기본값은 메서드로 결정)별로 응답 시간을 따로 추적하며, timeout을 주면 적응형 타임아웃 대신 사용한다.
+        stream이면 응답 헤더까지만 받아 반환하므로 호출자가 응답을 닫아야 한다.
+        """
+        breaker = self._get_breaker(base_url)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"에이전트 회로가 열려 있어 요청을 보내지 않습니다: {base_url}")
+
+        latency = self._get_latency(base_url, operation or self._operation(method))
+        client = self._get_http_client(base_url)
+        timeout = (latency.get_timeout() if timeout is None else timeout) + wait
+        started_at = time.monotonic()
+        recorded = False
+        in_flight = self._long_polls if long_poll else self._outstanding
+        in_flight[base_url] = in_flight.get(base_url, 0) + 1
+        try:
+            if stream:
+                request = client.build_request(method, url, timeout=timeout, **kwargs)
+                response = await client.send(request, stream=True)
+            else:
+                response = await client.request(method, url, timeout=timeout, **kwargs)
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+                if not wait:
+                    latency.record(time.monotonic() - started_at)
+            recorded = True
+            return response
+        except httpx.TransportError:
+            # 연결 실패 및 타임아웃
+            breaker.record_failure()
+            recorded = True
+            raise
+        finally:
+            in_flight[base_url] -= 1
+            if not recorded:
+                breaker.release()
+
+    async def _request_with_retry(self, method: str, base_url: str, url: str, **kwargs) -> httpx.Response:
+        """멱등한 요청을 일시적 오류(연결 실패, 타임아웃, 429/502/503/504)에 대해 지수 백오프로 재시도"""
+        for attempt in range(self.max_retries + 1):
+            is_last = attempt == self.max_retries
+            delay = self.retry_backoff * (2 ** attempt)
+            try:
+                response = await self._request(method, base_url, url, **kwargs)
+            except httpx.TransportError:
+                if is_last:
+                    raise
+            else:
+                if is_last or response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = float(retry_after)
+
+            self.retried_requests += 1
+            await asyncio.sleep(min(delay, self.max_retry_delay) * random.uniform(0.5, 1.0))
+
+    def register_endpoint(self, agent_id: str, endpoint: str):
+        """에이전트 ID에 복제본 엔드포인트 추가"""
+        endpoints = self.agent_endpoints.setdefault(agent_id, [])
+        if endpoint not in endpoints:
+            endpoints.append(endpoint)
+
+    def _get_endpoints(self, agent_id: str) -> List[str]:
+        """에이전트의 복제본 엔드포인트 목록 (등록된 것이 없으면 카드의 base_url)"""
+        agent_card = self.registered_agents[agent_id]
+        return self.agent_endpoints.get(agent_card.id) or [agent_card.base_url]
+
+    def _pick_endpoint(self, agent_id: str, exclude: Optional[str] = None) -> Optional[str]:
+        """진행 중인 요청이 가장 적은 복제본 선택 (회로가 열린 복제본은 가능한 한 제외)"""
+        candidates = [endpoint for endpoint in self._get_endpoints(agent_id) if endpoint != exclude]
+        if not candidates:
+            return None
+
+        available = [
+            endpoint for endpoint in candidates
+            if endpoint not in self._breakers or not self._breakers[endpoint].is_open()
+        ]
+        return min(available or candidates, key=lambda endpoint: (self._outstanding.get(endpoint, 0), random.random()))
+
+    def _pin_task(self, task_id: str, endpoint: str):
+        """작업을 생성한 복제본 기록 (오래된 기록부터 제거)"""
+        self._task_endpoints[task_id] = endpoint
+        self._task_endpoints.move_to_end(task_id)
+        while len(self._task_endpoints) > self.max_tracked_tasks:
+            self._task_endpoints.popitem(last=False)
+
+    def _get_task_endpoint(self, agent_id: str, task_id: str) -> str:
+        """작업을 생성한 복제본 (기록이 없으면 부하가 가장 적은 복제본)"""
+        return self._task_endpoints.get(task_id) or self._pick_endpoint(agent_id)
+
+    async def _hedged_get(self, agent_id: str, primary: str, path: str, **kwargs) -> httpx.Response:
+        """조회 요청 헤지: 주 복제본이 p95 응답 시간 안에 응답하지 않으면 다른 복제본에도 요청
+
+        먼저 도착한 성공 응답을 사용하고, 다른 복제본의 오류 응답(예: 작업이 없는 404)은
+        주 복제본의 응답을 기다리는 동안 무시한다.
+        """
+        alternate = self._pick_endpoint(agent_id, exclude=primary) if self.hedge_reads else None
+        delay = self._get_latency(primary, "read").get_hedge_delay() if alternate else None
+        if delay is None:
+            return await self._request("GET", primary, f"{primary}{path}", **kwargs)
+
+        first = asyncio.ensure_future(self._request("GET", primary, f"{primary}{path}", **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.hedged_requests += 1
+        second = asyncio.ensure_future(self._request("GET", alternate, f"{alternate}{path}", **kwargs))
+        pending = {first, second}
+        fallback: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    response = future.result()
+                    if response.status_code < 400:
+                        return response
+                    if fallback is None or future is first:
+                        fallback = response
+            if fallback is not None:
+                return fallback
+            raise error
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _singleflight(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        """동일한 키의 동시 조회를 하나의 요청으로 합쳐 결과를 공유
+
+        결과 객체는 모든 호출자가 공유하므로 호출자는 이를 수정하지 않아야 한다.
+        호출자 하나가 취소되어도 공유 요청은 다른 호출자를 위해 계속 진행된다.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(fetch())
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced_requests += 1
+
+        return await asyncio.shield(inflight)
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> Any:
+        """응답의 Content-Encoding을 해제하고 Content-Type(msgpack/JSON)에 맞춰 본문 디코딩"""
+        content = compression.decompress(response.content, response.headers.get("content-encoding"))
+        return codec.decode(content, response.headers.get("content-type"))
+
+    def is_available(self, agent_id: str) -> bool:
+        """에이전트 회로가 열려 있지 않은지 확인"""
+        if agent_id not in self.registered_agents:
+            return False
+        return any(
+            endpoint not in self._breakers or not self._breakers[endpoint].is_open()
+            for endpoint in self._get_endpoints(agent_id)
+        )
+
+    def get_agent_health(self) -> Dict[str, Dict[str, Any]]:
+        """에이전트(base_url)별 회로 상태와 요청 종류별 응답 시간 통계"""
+        health = {}
+        for base_url, breaker in self._breakers.items():
+            health[base_url] = {
+                "state": breaker.state,
+                "consecutive_failures": breaker.consecutive_failures,
+                "outstanding": self._outstanding.get(base_url, 0),
+                "long_polls": self._long_polls.get(base_url, 0),
+                "latency": {
+                    operation: latency.get_stats()
+                    for (latency_url, operation), latency in self._latencies.items()
+                    if latency_url == base_url
+                },
+            }
+        return health
+
+    async def aclose(self):
+        """모든 공유 HTTP 클라이언트 연결 종료"""
+        clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in clients:
+            await client.aclose()
+
     async def discover_agent(self, agent_url: str) -> AgentCard:
         """에이전트 카드를 검색하여 에이전트 정보 확인"""
+        return await self._singleflight(("discover", agent_url), lambda: self._fetch_agent_card(agent_url))
+
+    async def _fetch_agent_card(self, agent_url: str) -> AgentCard:
+        """에이전트 카드 조회 및 등록"""
+        cached = self.card_cache.get(agent_url, allow_stale=True) if self.card_cache else None
+        headers = {"If-None-Match": cached[1]} if cached and cached[1] else {}
+
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{agent_url}/.well-known/agent.json")
+            response = await self._request("GET", agent_url, f"{agent_url}/.well-known/agent.json", headers=headers)
+
+            if response.status_code == 304 and cached:
+                # 카드가 변경되지 않았으므로 캐시된 카드 사용
+                agent_card = cached[0]
+                self.card_cache.touch(agent_url)
+            else:
                 response.raise_for_status()
-                agent_card = AgentCard.model_validate(response.json())
-                self.registered_agents[agent_card.id] = agent_card
-                return agent_card
+                agent_card = AgentCard.model_validate(self._decode(response))
+                if self.card_cache:
+                    self.card_cache.put(agent_url, agent_card, response.headers.get("ETag"))
+
+            self.registered_agents[agent_card.id] = agent_card
+            self.register_endpoint(agent_card.id, agent_url)
+            return agent_card
+        except CircuitOpenError:
+            raise
         except Exception as e:
             traceback.print_exc()
             raise Exception(f"에이전트 발견 오류: {str(e)}")
 
-    async def create_task(self, agent_id: str, title: str, description: str, metadata: Optional[Dict[str, Any]] = None) -> Task:
+    def load_cached_agent(self, agent_url: str) -> Optional[AgentCard]:
+        """TTL 이내의 캐시된 에이전트 카드를 등록하고 반환 (없으면 None)"""
+        if self.card_cache is None:
+            return None
+
+        cached = self.card_cache.get(agent_url)
+        if cached is None:
+            return None
+
+        agent_card = cached[0]
+        self.registered_agents[agent_card.id] = agent_card
+        self.register_endpoint(agent_card.id, agent_url)
+        return agent_card
+
+    async def create_task(
+        self,
+        agent_id: str,
+        title: str,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
+    ) -> Task:
         """다른 에이전트에게 새 작업 생성 요청"""
         if agent_id not in self.registered_agents:
             raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
 
-        agent_card = self.registered_agents[agent_id]
+        endpoint = self._pick_endpoint(agent_id)
         task_id = f"task_{uuid.uuid4().hex[:10]}"
 
+        task_metadata = dict(metadata or {})
+        if callback_url:
+            # 원격 에이전트가 응답을 추가하면 callback_url로 결과를 전송
+            # (작업 메타데이터와 함께 돌아오는 토큰으로 위조된 콜백을 거름)
+            callback_token = secrets.token_urlsafe(24)
+            task_metadata["callback_url"] = callback_url
+            task_metadata["callback_token"] = callback_token
+            self.expect_callback(task_id, callback_token)
+
         task_data = {
             "id": task_id,
             "title": title,
             "description": description,
-            "metadata": metadata or {}
+            "metadata": task_metadata
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{agent_card.base_url}/a2a/tasks",
-                    json=task_data
+            # 작업 ID를 멱등성 키로 사용하여 재시도해도 작업이 중복 생성되지 않음
+            response = await self._request_with_retry(
+                "POST",
+                endpoint,
+                f"{endpoint}/a2a/tasks",
+                json=task_data,
+                headers={"Idempotency-Key": task_id},
+            )
+            response.raise_for_status()
+            self._pin_task(task_id, endpoint)
+            return Task.model_validate(self._decode(response))
+        except CircuitOpenError:
+            self.discard_callback(task_id)
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            self.discard_callback(task_id)
+            raise Exception(f"작업 생성 오류: {str(e)}")
+
+    async def create_tasks(self, agent_id: str, tasks: List[Dict[str, Any]], batch_size: int = 500) -> TaskBatchResult:
+        """여러 작업을 일괄 생성 (batch_size 단위로 나누어 요청)"""
+        if agent_id not in self.registered_agents:
+            raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
+
+        endpoint = self._pick_endpoint(agent_id)
+
+        tasks_data = []
+        for task in tasks:
+            tasks_data.append({
+                "id": task.get("id") or f"task_{uuid.uuid4().hex[:10]}",
+                "title": task.get("title", "새 작업"),
+                "description": task.get("description", ""),
+                "metadata": task.get("metadata") or {}
+            })
+
+        result = TaskBatchResult()
+        try:
+            for start in range(0, len(tasks_data), batch_size):
+                response = await self._request(
+                    "POST",
+                    endpoint,
+                    f"{endpoint}/a2a/tasks:batch",
+                    # 일괄 요청은 처리 시간이 길어 응답 시간 통계에서 제외하고 타임아웃을 추가로 허용
+                    wait=self.timeout,
+                    json={"tasks": tasks_data[start:start + batch_size]}
                 )
                 response.raise_for_status()
-                return Task.model_validate(response.json())
+                chunk = TaskBatchResult.model_validate(self._decode(response))
+                for task in chunk.tasks:
+                    self._pin_task(task.id, endpoint)
+                result.tasks.extend(chunk.tasks)
+                result.errors.extend(chunk.errors)
+            return result
+        except CircuitOpenError:
+            raise
         except Exception as e:
             traceback.print_exc()
-            raise Exception(f"작업 생성 오류: {str(e)}")
+            raise Exception(f"일괄 작업 생성 오류: {str(e)}")
 
     async def send_message(self, agent_id: str, task_id: str, content: str, message_type: MessageType = MessageType.TEXT) -> Message:
         """기존 작업에 새 메시지 전송"""
         if agent_id not in self.registered_agents:
             raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
 
-        agent_card = self.registered_agents[agent_id]
+        endpoint = self._get_task_endpoint(agent_id, task_id)
         message_id = f"msg_{uuid.uuid4().hex[:10]}"
 
         message_data = {
@@ -70,31 +511,321 @@ class A2AClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{agent_card.base_url}/a2a/tasks/{task_id}/messages",
-                    json=message_data
-                )
-                response.raise_for_status()
-                return Message.model_validate(response.json())
+            # 메시지 ID를 멱등성 키로 사용하여 재시도해도 메시지가 중복 추가되지 않음
+            response = await self._request_with_retry(
+                "POST",
+                endpoint,
+                f"{endpoint}/a2a/tasks/{task_id}/messages",
+                json=message_data,
+                headers={"Idempotency-Key": message_id},
+            )
+            response.raise_for_status()
+            return Message.model_validate(self._decode(response))
+        except CircuitOpenError:
+            raise
         except Exception as e:
             traceback.print_exc()
             raise Exception(f"메시지 전송 오류: {str(e)}")
 
-    async def get_task_status(self, agent_id: str, task_id: str) -> Task:
-        """작업 상태 확인"""
+    async def get_task_status(self, agent_id: str, task_id: str, wait: Optional[float] = None) -> Task:
+        """작업 상태 확인
+
+        이전에 확인한 버전이 있으면 변경될 때까지 long-poll하고, 이전에 받은 사본이 있으면
+        새 메시지만 받아 로컬 사본에 병합한 전체 작업을 반환한다.
+        """
         if agent_id not in self.registered_agents:
             raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
 
-        agent_card = self.registered_agents[agent_id]
+        endpoint = self._get_task_endpoint(agent_id, task_id)
 
+        if wait is None:
+            wait = self.long_poll_wait
+
+        params = {}
+        since_version = self._task_versions.get(task_id)
+        if since_version is not None and wait > 0:
+            params = {"wait": wait, "since_version": since_version}
+        else:
+            since_version = None
+            wait = 0
+
+        # 이미 받은 메시지는 다시 받지 않음 (증분 조회)
+        cached = self._task_cache.get(task_id)
+        if cached is not None:
+            params["since_message"] = len(cached.messages)
+
+        # 같은 버전 기준의 동시 조회는 하나의 요청으로 합침
+        key = ("task", endpoint, task_id, since_version)
+        return await self._singleflight(
+            key, lambda: self._fetch_task_status(agent_id, endpoint, task_id, wait, params)
+        )
+
+    async def _fetch_task_status(self, agent_id: str, endpoint: str, task_id: str, wait: float, params: Dict[str, Any]) -> Task:
+        """작업 상태 조회 및 버전 기록"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{agent_card.base_url}/a2a/tasks/{task_id}"
+            if wait > 0:
+                response = await self._request(
+                    "GET",
+                    endpoint,
+                    f"{endpoint}/a2a/tasks/{task_id}",
+                    wait=wait,
+                    long_poll=True,
+                    params=params
                 )
-                response.raise_for_status()
-                return Task.model_validate(response.json())
+            else:
+                # long-poll이 아닌 조회만 헤지 (long-poll은 응답 지연이 정상)
+                response = await self._hedged_get(agent_id, endpoint, f"/a2a/tasks/{task_id}", params=params)
+            response.raise_for_status()
+
+            # long-poll을 지원하는 서버만 버전 헤더를 반환
+            version = response.headers.get("X-Task-Version")
+            if version is not None:
+                self._track_version(task_id, int(version))
+
+            task = Task.model_validate(self._decode(response))
+            return self._merge_task(task, response.headers.get("X-Task-Message-Offset"))
+        except CircuitOpenError:
+            raise
         except Exception as e:
             traceback.print_exc()
             raise Exception(f"작업 상태 확인 오류: {str(e)}")
+
+    def _track_version(self, task_id: str, version: int):
+        """작업 버전 기록 (최근에 조회한 작업만 유지)"""
+        self._task_versions[task_id] = version
+        self._task_versions.move_to_end(task_id)
+        while len(self._task_versions) > self.max_tracked_tasks:
+            self._task_versions.popitem(last=False)
+
+    def _merge_task(self, task: Task, message_offset: Optional[str]) -> Task:
+        """증분 조회 결과를 로컬 사본에 병합 (오프셋 헤더가 없으면 전체 메시지를 받은 것으로 처리)"""
+        cached = self._task_cache.get(task.id)
+        if message_offset is not None and cached is not None:
+            task.messages = cached.messages[:int(message_offset)] + task.messages
+
+        self._task_cache[task.id] = task
+        self._task_cache.move_to_end(task.id)
+        while len(self._task_cache) > self.max_tracked_tasks:
+            self._task_cache.popitem(last=False)
+        return task
+
+    async def get_tasks_status(self, agent_id: str, task_ids: List[str], batch_size: int = 500) -> Dict[str, Task]:
+        """여러 작업 상태를 일괄 확인 (찾을 수 없는 작업은 결과에서 제외)"""
+        if agent_id not in self.registered_agents:
+            raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
+
+        # 작업을 생성한 복제본별로 나누어 조회
+        grouped: Dict[str, List[str]] = {}
+        for task_id in task_ids:
+            grouped.setdefault(self._get_task_endpoint(agent_id, task_id), []).append(task_id)
+
+        tasks: Dict[str, Task] = {}
+        try:
+            for endpoint, endpoint_task_ids in grouped.items():
+                for start in range(0, len(endpoint_task_ids), batch_size):
+                    response = await self._request(
+                        "POST",
+                        endpoint,
+                        f"{endpoint}/a2a/tasks:status",
+                        wait=self.timeout,
+                        json={"task_ids": endpoint_task_ids[start:start + batch_size]}
+                    )
+                    response.raise_for_status()
+                    chunk = TaskStatusBatch.model_validate(self._decode(response))
+                    for task in chunk.tasks:
+                        tasks[task.id] = task
+            return tasks
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            raise Exception(f"일괄 작업 상태 확인 오류: {str(e)}")
+
+    def get_task_version(self, task_id: str) -> Optional[int]:
+        """마지막으로 확인한 작업 버전 (long-poll 미지원 서버이면 None)"""
+        return self._task_versions.get(task_id)
+
+    def forget_task(self, task_id: str):
+        """더 이상 추적하지 않는 작업의 버전, 사본, 복제본 및 콜백 정보 정리"""
+        self._task_versions.pop(task_id, None)
+        self._task_cache.pop(task_id, None)
+        self._task_endpoints.pop(task_id, None)
+        self.discard_callback(task_id)
+
+    async def subscribe(self, agent_id: str, task_id: str) -> AsyncIterator[TaskEvent]:
+        """작업 상태 변경과 새 메시지를 SSE로 구독 (작업이 끝나면 종료)"""
+        endpoint = self._get_stream_endpoint(agent_id, task_id)
+
+        try:
+            client = self._get_http_client(endpoint)
+            # 이벤트 사이의 대기 시간은 제한하지 않음 (서버가 keepalive 주석 전송)
+            async with client.stream(
+                "GET",
+                f"{endpoint}/a2a/tasks/{task_id}/events",
+                headers={"Accept": "text/event-stream"},
+                timeout=httpx.Timeout(self.timeout, read=None),
+            ) as response:
+                response.raise_for_status()
+
+                data_lines = []
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].strip())
+                    elif not line and data_lines:
+                        # 빈 줄에서 이벤트 하나가 끝남
+                        yield TaskEvent.model_validate(json.loads("\n".join(data_lines)))
+                        data_lines = []
+        except Exception as e:
+            traceback.print_exc()
+            raise Exception(f"작업 구독 오류: {str(e)}")
+
+    def _get_stream_endpoint(self, agent_id: str, task_id: str) -> str:
+        """스트리밍 요청(구독, 파일 전송)을 보낼 작업 복제본 (회로가 열려 있으면 CircuitOpenError)"""
+        if agent_id not in self.registered_agents:
+            raise ValueError(f"등록되지 않은 에이전트: {agent_id}")
+
+        endpoint = self._get_task_endpoint(agent_id, task_id)
+        breaker = self._breakers.get(endpoint)
+        if breaker is not None and breaker.is_open():
+            raise CircuitOpenError(f"에이전트 회로가 열려 있어 요청을 보내지 않습니다: {endpoint}")
+        return endpoint
+
+    async def upload_artifact(
+        self,
+        agent_id: str,
+        task_id: str,
+        source: Union[str, AsyncIterator[bytes]],
+        name: Optional[str] = None,
+        content_type: Optional[str] = None,
+        artifact_type: Optional[MessageType] = None,
+    ) -> Artifact:
+        """파일 경로 또는 바이트 청크 스트림을 작업 아티팩트로 업로드 (청크 단위로 전송)"""
+        endpoint = self._get_stream_endpoint(agent_id, task_id)
+        if isinstance(source, str):
+            name = name or os.path.basename(source)
+            source = iter_file(source)
+        name = name or "artifact"
+
+        params = {"name": name}
+        if artifact_type is not None:
+            params["type"] = artifact_type.value
+
+        try:
+            # 전송 시간이 파일 크기에 따라 달라지므로 적응형 타임아웃 대신 최대 타임아웃 사용
+            response = await self._request(
+                "POST",
+                endpoint,
+                f"{endpoint}/a2a/tasks/{task_id}/artifacts",
+                operation="artifact",
+                timeout=self.timeout,
+                params=params,
+                content=source,
+                headers={"Content-Type": content_type or guess_content_type(name)},
+            )
+            response.raise_for_status()
+            return Artifact.model_validate(self._decode(response))
+        except Exception as e:
+            traceback.print_exc()
+            raise Exception(f"아티팩트 업로드 오류: {str(e)}")
+
+    async def iter_artifact(self, agent_id: str, task_id: str, artifact_id: str, offset: int = 0) -> AsyncIterator[bytes]:
+        """아티팩트를 청크 단위로 다운로드 (offset 바이트부터 이어받기)"""
+        endpoint = self._get_stream_endpoint(agent_id, task_id)
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            # 응답 시간은 본문 전송 전 응답 헤더를 받을 때까지만 기록
+            response = await self._request(
+                "GET",
+                endpoint,
+                f"{endpoint}/a2a/tasks/{task_id}/artifacts/{artifact_id}",
+                operation="artifact",
+                timeout=self.timeout,
+                stream=True,
+                headers=headers,
+            )
+            try:
+                # 이미 끝까지 받은 파일
+                if offset and response.status_code == 416:
+                    return
+                response.raise_for_status()
+
+                # 서버가 Range를 무시하고 전체 파일을 보낸 경우 앞부분을 건너뜀
+                skip = offset if response.status_code == 200 else 0
+                async for chunk in response.aiter_bytes():
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk, skip = chunk[skip:], 0
+                    yield chunk
+            finally:
+                await response.aclose()
+        except Exception as e:
+            traceback.print_exc()
+            raise Exception(f"아티팩트 다운로드 오류: {str(e)}")
+
+    async def download_artifact(
+        self, agent_id: str, task_id: str, artifact_id: str, destination: str, resume: bool = True
+    ) -> str:
+        """아티팩트를 파일로 다운로드 (resume이면 이미 받은 부분 다음부터 이어받기)"""
+        offset = os.path.getsize(destination) if resume and os.path.exists(destination) else 0
+        file = await asyncio.to_thread(open, destination, "ab" if offset else "wb")
+        try:
+            async for chunk in self.iter_artifact(agent_id, task_id, artifact_id, offset=offset):
+                await asyncio.to_thread(file.write, chunk)
+        finally:
+            await asyncio.to_thread(file.close)
+        return destination
+
+    def expect_callback(self, task_id: str, token: Optional[str] = None) -> asyncio.Future:
+        """작업 콜백을 기다릴 Future 등록 (token은 위임할 때 작업 메타데이터로 보낸 콜백 토큰)"""
+        if token is not None:
+            self._callback_tokens[task_id] = token
+        future = self._pending_callbacks.get(task_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_callbacks[task_id] = future
+        return future
+
+    def resolve_callback(self, task: Task) -> bool:
+        """수신한 콜백으로 대기 중인 Future 완료 (기다리는 작업이 아니거나 토큰이 다르면 False)"""
+        future = self._pending_callbacks.get(task.id)
+        expected_token = self._callback_tokens.get(task.id)
+        if future is None or expected_token is None:
+            return False
+
+        received_token = task.metadata.get("callback_token") if task.metadata else None
+        if not isinstance(received_token, str) or not hmac.compare_digest(received_token, expected_token):
+            logger.warning(f"콜백 토큰이 일치하지 않아 무시합니다: {task.id}")
+            return False
+
+        if future.done():
+            # 아직 소비되지 않은 이전 결과는 최신 상태로 교체
+            future = asyncio.get_running_loop().create_future()
+            self._pending_callbacks[task.id] = future
+        future.set_result(task)
+        return True
+
+    async def wait_for_callback(self, task_id: str, timeout: float) -> Optional[Task]:
+        """작업 콜백을 최대 timeout초 동안 대기 (시간 초과 시 None)"""
+        future = self.expect_callback(task_id)
+        try:
+            task = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        # 결과를 소비했으므로 다음 콜백을 위한 새 Future로 교체
+        self._pending_callbacks[task_id] = asyncio.get_running_loop().create_future()
+        return task
+
+    def has_pending_callback(self, task_id: str) -> bool:
+        """콜백을 기다리도록 등록된 작업인지 확인"""
+        return task_id in self._pending_callbacks
+
+    def discard_callback(self, task_id: str):
+        """더 이상 기다리지 않는 작업의 콜백 등록 해제"""
+        self._callback_tokens.pop(task_id, None)
+        future = self._pending_callbacks.pop(task_id, None)
+        if future is not None and not future.done():
+            future.cancel()
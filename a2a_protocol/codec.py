@@ -0,0 +1,94 @@
+"""
+A2A 메시지 직렬화 모듈
+Accept 헤더에 따라 application/msgpack 또는 JSON으로 응답을 인코딩합니다.
+msgpack 패키지가 없으면 항상 JSON을 사용합니다.
+"""
+import json
+from typing import Any, Dict, Optional, Union
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def msgpack_available() -> bool:
+    """msgpack 패키지 설치 여부"""
+    return msgpack is not None
+
+
+def accept_header() -> str:
+    """클라이언트가 보낼 Accept 헤더 (msgpack 우선, JSON 대체)"""
+    if msgpack_available():
+        return f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9"
+    return JSON_MEDIA_TYPE
+
+
+def prefers_msgpack(request: Request) -> bool:
+    """요청의 Accept 헤더가 msgpack을 허용하는지 확인"""
+    if not msgpack_available():
+        return False
+
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, *params = media_range.split(";")
+        if media_type.strip().lower() != MSGPACK_MEDIA_TYPE:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+def encode(data: Union[BaseModel, Dict[str, Any]], media_type: str) -> bytes:
+    """모델 또는 dict를 지정한 형식으로 인코딩"""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        if isinstance(data, BaseModel):
+            data = data.model_dump()
+        # datetime은 msgpack Timestamp 확장 타입으로 인코딩 (ISO 문자열보다 작고 빠름)
+        return msgpack.packb(data, use_bin_type=True, datetime=True)
+
+    if isinstance(data, BaseModel):
+        return data.model_dump_json().encode("utf-8")
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def decode(content: bytes, content_type: Optional[str]) -> Any:
+    """Content-Type에 따라 응답 본문 디코딩"""
+    if content_type and content_type.split(";")[0].strip().lower() == MSGPACK_MEDIA_TYPE:
+        if not msgpack_available():
+            raise ValueError("msgpack 응답을 디코딩하려면 msgpack 패키지가 필요합니다")
+        return msgpack.unpackb(content, raw=False, timestamp=3)
+    return json.loads(content)
+
+
+def encode_response(
+    request: Request,
+    data: Union[BaseModel, Dict[str, Any]],
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """요청의 Accept 헤더에 맞춰 인코딩한 응답 생성"""
+    media_type = MSGPACK_MEDIA_TYPE if prefers_msgpack(request) else JSON_MEDIA_TYPE
+    response_headers = {"Vary": "Accept"}
+    if headers:
+        response_headers.update(headers)
+    return Response(
+        content=encode(data, media_type),
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
@@ -0,0 +1,137 @@
+"""
+A2A 응답 압축 모듈
+Accept-Encoding 헤더에 따라 일정 크기 이상의 응답을 zstd 또는 gzip으로 압축합니다.
+zstandard 패키지가 없으면 gzip만 사용하며, SSE 같은 스트리밍 응답은 압축하지 않습니다.
+"""
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 서버가 선호하는 순서 (클라이언트가 같은 q 값으로 둘 다 허용하면 앞의 것 사용)
+SUPPORTED_ENCODINGS = ("zstd", "gzip")
+
+# 이미 압축된 형식이거나 스트리밍 응답이라 압축하지 않을 Content-Type
+UNCOMPRESSIBLE_MEDIA_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip", "application/zstd")
+
+
+def zstd_available() -> bool:
+    """zstandard 패키지 설치 여부"""
+    return zstandard is not None
+
+
+def accept_encoding_header() -> str:
+    """클라이언트가 보낼 Accept-Encoding 헤더 (zstd 우선, gzip 대체)"""
+    if zstd_available():
+        return "zstd, gzip;q=0.9"
+    return "gzip"
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (없으면 None)"""
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    candidates = [
+        encoding
+        for encoding in SUPPORTED_ENCODINGS
+        if (encoding != "zstd" or zstd_available()) and qualities.get(encoding, qualities.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: qualities.get(encoding, qualities.get("*", 0.0)))
+
+
+def compress(content: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """지정한 방식으로 본문 압축"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level or 3).compress(content)
+    return gzip.compress(content, compresslevel=level or 6, mtime=0)
+
+
+def decompress(content: bytes, content_encoding: Optional[str]) -> bytes:
+    """httpx가 풀지 못하는 zstd 응답 본문 해제 (gzip은 httpx가 자동으로 해제)"""
+    if not content_encoding or content_encoding.strip().lower() != "zstd":
+        return content
+    if not zstd_available():
+        raise ValueError("zstd 응답을 해제하려면 zstandard 패키지가 필요합니다")
+    return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+
+
+class CompressionMiddleware:
+    """minimum_size 바이트 이상인 응답을 클라이언트가 허용하는 방식으로 압축하는 ASGI 미들웨어
+
+    본문이 한 번에 전송되는 응답만 압축하며, 스트리밍 응답(SSE 등)과 이미 인코딩된 응답은 그대로 전달한다.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            # 첫 번째 본문 메시지에서 압축 여부 결정
+            passthrough = True
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is not None and len(body) >= self.minimum_size and self._is_compressible(headers):
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _is_compressible(headers: MutableHeaders) -> bool:
+        """압축할 수 있는 응답인지 확인"""
+        # 이미 인코딩된 응답과 Range 요청을 지원하는 파일 응답(바이트 위치 유지)은 제외
+        if "content-encoding" in headers or "accept-ranges" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(UNCOMPRESSIBLE_MEDIA_TYPES)
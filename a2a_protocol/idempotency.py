@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """같은 멱등성 키로 다른 내용의 요청이 들어온 경우 발생하는 예외"""
+
+
+class IdempotencyStore:
+    """멱등성 키별 처리 결과를 보관하는 저장소 (최근 max_entries개, ttl초 동안)
+
+    같은 키의 재시도는 원래 요청을 다시 처리하지 않고 저장된 결과를 반환하며,
+    원래 요청이 아직 처리 중이면 그 결과를 함께 기다린다.
+    실패한 요청의 키는 저장하지 않으므로 다시 시도할 수 있다.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str, asyncio.Future]]" = OrderedDict()
+
+        # 재시도 통계
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        """요청 내용 지문"""
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Tuple[float, str, asyncio.Future]]:
+        """만료되지 않은 항목 조회"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+    async def run(self, key: str, payload: Any, handler: Callable[[], Awaitable[T]]) -> T:
+        """키에 대한 결과가 있으면 반환하고, 없으면 handler를 실행하여 결과 저장"""
+        fingerprint = self.fingerprint(payload)
+        entry = self._get(key)
+        if entry is not None:
+            if entry[1] != fingerprint:
+                raise IdempotencyKeyMismatchError(f"멱등성 키가 다른 요청에 이미 사용되었습니다: {key}")
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return await asyncio.shield(entry[2])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (time.monotonic(), fingerprint, future)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        try:
+            result = await handler()
+        except BaseException as e:
+            # 실패한 요청은 재시도할 수 있도록 키 제거 (함께 기다리던 요청에는 같은 오류 전달)
+            if self._entries.get(key, (None, None, None))[2] is future:
+                del self._entries[key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()
+            else:
+                future.cancel()
+            raise
+
+        future.set_result(result)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장된 키 수와 재시도 적중 통계"""
+        return {
+            "keys": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
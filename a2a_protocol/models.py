@@ -38,6 +38,10 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# 더 이상 변경되지 않는 작업 상태
+FINAL_TASK_STATUSES = {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+
+
 class Task(BaseModel):
     id: str
     title: str
@@ -48,6 +52,13 @@ class Task(BaseModel):
     messages: List[Message] = []
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    def latest_text_message(self) -> Optional[Message]:
+        """가장 최근의 텍스트 메시지 (첨부 파일 메시지는 건너뜀, 없으면 None)"""
+        for message in reversed(self.messages):
+            if message.type == MessageType.TEXT and isinstance(message.content, str):
+                return message
+        return None
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -63,6 +74,27 @@ class Task(BaseModel):
         }
 
 
+class TaskBatchResult(BaseModel):
+    """일괄 작업 생성 결과"""
+    tasks: List[Task] = []
+    errors: List[Dict[str, Any]] = []
+
+
+class TaskStatusBatch(BaseModel):
+    """일괄 작업 상태 조회 결과"""
+    tasks: List[Task] = []
+    missing: List[str] = []
+
+
+class TaskEvent(BaseModel):
+    """작업 구독(SSE) 스트림으로 전달되는 이벤트"""
+    type: str  # "status" 또는 "message"
+    task_id: str
+    status: TaskStatus
+    updated_at: datetime
+    message: Optional[Message] = None
+
+
 class AgentCapability(BaseModel):
     name: str
     description: str
@@ -0,0 +1,65 @@
+"""
+작업 우선순위 모듈
+Task.metadata의 priority, 고객 등급(tier), SLA 마감 시각으로 처리 우선순위를 계산합니다.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+
+from a2a_protocol.models import Task
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+PRIORITY_VALUES = {name: value for value, name in PRIORITY_NAMES.items()}
+
+# 높은 우선순위로 처리할 고객 등급
+HIGH_PRIORITY_TIERS = {"vip", "platinum", "gold", "premium"}
+
+# 위임 작업에 그대로 전달할 우선순위 관련 메타데이터 키
+PRIORITY_METADATA_KEYS = ("priority", "tier", "customer_tier", "sla_deadline", "sla_seconds")
+
+
+def task_priority(task: Task) -> int:
+    """작업 우선순위 (명시적 priority > 고객 등급 > 기본값 normal)"""
+    metadata = task.metadata or {}
+
+    priority = metadata.get("priority")
+    if isinstance(priority, str) and priority.lower() in PRIORITY_VALUES:
+        return PRIORITY_VALUES[priority.lower()]
+    if isinstance(priority, int) and priority in PRIORITY_NAMES:
+        return priority
+
+    tier = metadata.get("tier") or metadata.get("customer_tier")
+    if isinstance(tier, str) and tier.lower() in HIGH_PRIORITY_TIERS:
+        return PRIORITY_HIGH
+
+    return PRIORITY_NORMAL
+
+
+def task_deadline(task: Task) -> Optional[float]:
+    """SLA 마감 시각 (epoch 초, 없으면 None)"""
+    metadata = task.metadata or {}
+
+    try:
+        if metadata.get("sla_deadline"):
+            deadline = datetime.fromisoformat(str(metadata["sla_deadline"]).replace("Z", "+00:00"))
+            if deadline.tzinfo is None:
+                deadline = deadline.replace(tzinfo=timezone.utc)
+            return deadline.timestamp()
+
+        if metadata.get("sla_seconds") is not None:
+            created_at = task.created_at if task.created_at.tzinfo else task.created_at.replace(tzinfo=timezone.utc)
+            return (created_at + timedelta(seconds=float(metadata["sla_seconds"]))).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+    return None
+
+
+def priority_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """위임 작업에 전달할 우선순위 관련 메타데이터만 추출"""
+    if not metadata:
+        return {}
+    return {key: metadata[key] for key in PRIORITY_METADATA_KEYS if key in metadata}
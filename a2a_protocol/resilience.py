@@ -0,0 +1,119 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 에이전트 호출이 차단된 경우 발생하는 예외"""
+
+
+class CircuitBreaker:
+    """에이전트별 회로 차단기 (closed -> open -> half_open -> closed)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (half_open 상태에서는 탐색 요청 하나만 허용)"""
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+
+        # half_open: 탐색 요청이 진행 중이면 나머지는 차단
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def is_open(self) -> bool:
+        """요청이 즉시 차단되는 상태인지 확인 (상태는 변경하지 않음)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at < self.recovery_timeout
+        return self.state == self.HALF_OPEN and self._probe_in_flight
+
+    def record_success(self):
+        """요청 성공 기록 (half_open이면 회로를 닫음)"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        """요청 실패 기록 (연속 실패가 임계값에 도달하거나 탐색 요청이 실패하면 회로를 엶)"""
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release(self):
+        """결과 없이 끝난 요청(취소 등)의 탐색 슬롯 반환"""
+        self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """최근 응답 시간 분포를 기반으로 요청 타임아웃을 계산"""
+
+    def __init__(
+        self,
+        window_size: int = 200,
+        min_samples: int = 20,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 30.0,
+    ):
+        self.samples: Deque[float] = deque(maxlen=window_size)
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+
+    def record(self, seconds: float):
+        """응답 시간 기록"""
+        self.samples.append(seconds)
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        """최근 응답 시간의 백분위수 (샘플이 없으면 None)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(len(ordered) * percentile), len(ordered) - 1)
+        return ordered[index]
+
+    def get_hedge_delay(self, percentile: float = 0.95) -> Optional[float]:
+        """헤지 요청을 보내기 전 대기 시간 (샘플이 부족하면 None)"""
+        if len(self.samples) < self.min_samples:
+            return None
+        return self.get_percentile(percentile)
+
+    def get_timeout(self) -> float:
+        """관측된 백분위 응답 시간에 여유 배수를 곱한 타임아웃 (샘플이 부족하면 최대값)"""
+        if len(self.samples) < self.min_samples:
+            return self.max_timeout
+        timeout = self.get_percentile(self.percentile) * self.multiplier
+        return max(self.min_timeout, min(timeout, self.max_timeout))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """응답 시간 통계"""
+        return {
+            "samples": len(self.samples),
+            "p50": self.get_percentile(0.5),
+            "p95": self.get_percentile(0.95),
+            "p99": self.get_percentile(0.99),
+            "timeout": self.get_timeout(),
+        }
@@ -1,21 +1,104 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import traceback
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, Callable, Awaitable
+from typing import Dict, Any, Callable, Awaitable, Optional, Set, AsyncIterator
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 
-from a2a_protocol.models import Task, Message, TaskStatus, AgentCard, MessageType
+from a2a_protocol.artifact_store import ArtifactStore, ArtifactTooLargeError, guess_content_type, iter_file, parse_byte_range
+from a2a_protocol.codec import encode_response, prefers_msgpack
+from a2a_protocol.priority import task_priority, task_deadline
+from a2a_protocol.sharding import TaskSharding
+from a2a_protocol.idempotency import IdempotencyStore, IdempotencyKeyMismatchError
+from a2a_protocol.models import (
+    Task, Message, TaskStatus, AgentCard, MessageType, TaskEvent, TaskBatchResult, TaskStatusBatch, Artifact,
+    FINAL_TASK_STATUSES,
+)
+from a2a_protocol.task_store import TaskStore, InMemoryTaskStore
+from a2a_protocol.task_locks import TaskLocks
+from a2a_protocol.worker_pool import WorkerPool, WorkerPoolFullError
+
+logger = logging.getLogger(__name__)
 
 
 class A2AServer:
     """A2A 프로토콜 서버 구현"""
 
-    def __init__(self, agent_card: AgentCard):
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        callback_timeout: float = 10.0,
+        event_keepalive: float = 15.0,
+        max_long_poll_wait: float = 30.0,
+        max_batch_size: int = 1000,
+        max_tasks: int = 10000,
+        finished_task_ttl: float = 3600.0,
+        task_store: Optional[TaskStore] = None,
+        max_workers: int = 32,
+        max_queue_size: int = 1000,
+        idempotency_max_keys: int = 10000,
+        idempotency_ttl: float = 3600.0,
+        artifact_dir: Optional[str] = None,
+        max_artifact_size: int = 50 * 1024 * 1024,
+        sharding: Optional[TaskSharding] = None,
+        task_sweep_interval: float = 60.0,
+    ):
         self.agent_card = agent_card
-        self.tasks: Dict[str, Task] = {}
+        # 끝난 작업은 TTL/LRU로 제거되며, 제거 시 관련 핸들러와 버전 정보도 정리
+        if task_store is None:
+            task_store = InMemoryTaskStore(max_tasks=max_tasks, finished_ttl=finished_task_ttl)
+        self.tasks = task_store
+        self.tasks.add_eviction_listener(self._forget_task)
+
+        # 요청이 없어도 TTL이 지난 작업을 정리하는 백그라운드 작업 (start()에서 시작)
+        self.task_sweep_interval = task_sweep_interval
+        self._task_sweeper: Optional[asyncio.Task] = None
         self.message_handlers: Dict[str, Callable[[Task, Message], Awaitable[None]]] = {}
         self.router = APIRouter(prefix="/a2a")
 
+        # 작업 완료 콜백 전송용 HTTP 클라이언트 및 진행 중인 전송 작업
+        self.callback_timeout = callback_timeout
+        self._callback_client: Optional[httpx.AsyncClient] = None
+        self._callback_deliveries: Set[asyncio.Task] = set()
+
+        # 제거된 작업의 아티팩트 파일 삭제 작업
+        self._artifact_cleanups: Set[asyncio.Task] = set()
+
+        # 작업 변경 구독자 (task_id -> 변경 알림 Event 집합)
+        self.event_keepalive = event_keepalive
+        self._task_listeners: Dict[str, Set[asyncio.Event]] = {}
+
+        # 작업 변경 버전 (long-poll 조회 기준)
+        self.max_long_poll_wait = max_long_poll_wait
+        self.task_versions: Dict[str, int] = {}
+
+        # 일괄 요청 최대 크기
+        self.max_batch_size = max_batch_size
+
+        # 작업 처리 워커 풀 (대기열이 가득 차면 새 작업을 429로 거절)
+        self.worker_pool = WorkerPool(agent_card.id, max_workers=max_workers, max_queue_size=max_queue_size)
+
+        # 같은 작업에 대한 처리(새 작업 처리, 메시지 추가)를 도착 순서대로 하나씩 실행
+        self.task_locks = TaskLocks()
+
+        # Idempotency-Key별 처리 결과 (재시도 시 다시 처리하지 않고 처음 결과 반환)
+        self.idempotency = IdempotencyStore(max_entries=idempotency_max_keys, ttl=idempotency_ttl)
+
+        # 작업 첨부 파일 저장소 (지정하지 않으면 임시 디렉터리 사용)
+        if not artifact_dir:
+            artifact_dir = os.path.join(tempfile.gettempdir(), "a2a_artifacts", agent_card.id)
+        self.artifacts = ArtifactStore(artifact_dir, max_size=max_artifact_size)
+
+        # 작업 샤딩 (여러 워커/노드가 작업을 나눠 맡을 때 새 작업 ID는 이 노드가 담당하는 ID로 생성)
+        self.sharding = sharding
+
         # 라우트 설정
         self.setup_routes()
 
@@ -23,82 +106,447 @@ class A2AServer:
         """API 라우트 설정"""
 
         @self.router.get("/.well-known/agent.json")
-        async def get_agent_card():
-            return self.agent_card.model_dump()
+        async def get_agent_card(request: Request):
+            return self.agent_card_response(request)
+
+        @self.router.get("/metrics")
+        async def get_metrics():
+            return await self.get_metrics()
 
         @self.router.post("/tasks", response_model=Task)
-        async def create_task(task_data: dict):
-            task_id = task_data.get("id", f"task_{uuid.uuid4().hex[:10]}")
-
-            # 이미 존재하는 작업인지 확인
-            if task_id in self.tasks:
-                raise HTTPException(status_code=409, detail="작업 ID가 이미 존재합니다")
-
-            # 새 작업 생성
-            task = Task(
-                id=task_id,
-                title=task_data.get("title", "새 작업"),
-                description=task_data.get("description", ""),
-                status=TaskStatus.CREATED,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc),
-                metadata=task_data.get("metadata", {})
+        async def create_task(request: Request, task_data: dict):
+            task = await self.run_idempotent(
+                request.headers.get("Idempotency-Key"), "tasks", task_data, lambda: self._create_task(task_data)
             )
+            return encode_response(request, task)
 
-            self.tasks[task_id] = task
+        @self.router.post("/tasks:batch", response_model=TaskBatchResult)
+        async def create_tasks(request: Request, batch_data: dict):
+            tasks_data = batch_data.get("tasks", [])
+            if not isinstance(tasks_data, list):
+                raise HTTPException(status_code=422, detail="tasks는 작업 데이터 목록이어야 합니다")
+            self._check_batch_size(len(tasks_data))
 
-            # 새 작업 생성에 대한 핸들러 호출
-            await self.handle_new_task(task)
+            # 모든 작업을 먼저 검증한 뒤 생성 가능한 작업만 등록
+            result = TaskBatchResult()
+            seen_ids = set()
+            for index, task_data in enumerate(tasks_data):
+                if not isinstance(task_data, dict):
+                    result.errors.append({"index": index, "status_code": 422, "detail": "작업 데이터는 객체여야 합니다"})
+                    continue
+                task_id = task_data.get("id") or self.new_task_id()
+                if task_id in seen_ids or await self.tasks.acontains(task_id):
+                    result.errors.append({"id": task_id, "status_code": 409, "detail": "작업 ID가 이미 존재합니다"})
+                    continue
+                seen_ids.add(task_id)
+                try:
+                    result.tasks.append(self._build_task(task_id, task_data))
+                except Exception as e:
+                    result.errors.append({"id": task_id, "status_code": 422, "detail": str(e)})
+
+            admitted = []
+            for task in result.tasks:
+                await self.tasks.asave(task)
+                self._notify_listeners(task)
+                try:
+                    await self._admit_task(task)
+                    admitted.append(task)
+                except HTTPException as e:
+                    # 대기열이 가득 차 받지 못한 작업은 오류로 반환 (같은 ID로 재시도 가능)
+                    result.errors.append({"id": task.id, "status_code": e.status_code, "detail": e.detail})
+            result.tasks = admitted
+
+            return encode_response(request, result)
+
+        @self.router.post("/tasks:status", response_model=TaskStatusBatch)
+        async def get_tasks(request: Request, status_request: dict):
+            task_ids = status_request.get("task_ids", [])
+            self._check_batch_size(len(task_ids))
 
-            return task
+            result = TaskStatusBatch()
+            for task_id in task_ids:
+                task = await self.tasks.aget(task_id)
+                if task is None:
+                    result.missing.append(task_id)
+                else:
+                    result.tasks.append(task)
+
+            return encode_response(request, result)
 
         @self.router.get("/tasks/{task_id}", response_model=Task)
-        async def get_task(task_id: str):
-            if task_id not in self.tasks:
+        async def get_task(
+            request: Request,
+            task_id: str,
+            wait: float = 0.0,
+            since_version: Optional[int] = None,
+            since_message: Optional[int] = None,
+        ):
+            if not await self.tasks.acontains(task_id):
                 raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
-            return self.tasks[task_id]
+            # long-poll: since_version 이후 변경이 없으면 최대 wait초 동안 대기
+            if since_version is not None and wait > 0:
+                await self.wait_for_task_change(task_id, since_version, min(wait, self.max_long_poll_wait))
 
-        @self.router.post("/tasks/{task_id}/messages", response_model=Message)
-        async def add_message(task_id: str, message_data: dict):
-            if task_id not in self.tasks:
+            task = await self.tasks.aget(task_id)
+            if task is None:
                 raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+            headers = {"X-Task-Version": str(self.task_versions.get(task_id, 0))}
+
+            # 증분 조회: since_message 이후의 메시지만 반환 (커서가 맞지 않으면 전체 반환)
+            if since_message is not None:
+                offset = since_message if 0 <= since_message <= len(task.messages) else 0
+                task = task.model_copy(update={"messages": task.messages[offset:]})
+                headers["X-Task-Message-Offset"] = str(offset)
 
-            task = self.tasks[task_id]
+            return encode_response(request, task, headers=headers)
 
-            # 새 메시지 생성
-            message_id = message_data.get("id", f"msg_{uuid.uuid4().hex[:10]}")
-            message = Message(
-                id=message_id,
-                type=message_data.get("type", MessageType.TEXT),
-                content=message_data.get("content", ""),
-                created_at=datetime.now(timezone.utc)
+        @self.router.post("/tasks/{task_id}/messages", response_model=Message)
+        async def add_message(request: Request, task_id: str, message_data: dict):
+            message = await self.run_idempotent(
+                request.headers.get("Idempotency-Key"),
+                f"tasks/{task_id}/messages",
+                message_data,
+                lambda: self._add_message(task_id, message_data),
             )
+            return encode_response(request, message)
+
+        @self.router.put("/tasks/{task_id}", response_model=Task)
+        async def update_task(request: Request, task_id: str, task_update: dict):
+            # 처리 중인 핸들러나 메시지 추가와 겹치지 않도록 작업 잠금을 잡고 변경
+            async with self.task_locks.hold(task_id):
+                # 잠금을 기다리는 동안 작업이 제거되었을 수 있음
+                task = await self.tasks.aget(task_id)
+                if task is None:
+                    raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+                # 상태 업데이트
+                if "status" in task_update:
+                    task.status = TaskStatus(task_update["status"])
+
+                task.updated_at = datetime.now(timezone.utc)
+                await self.tasks.asave(task)
+                self._notify_listeners(task)
+
+            return encode_response(request, task)
+
+        @self.router.get("/tasks/{task_id}/events")
+        async def subscribe_task_events(task_id: str):
+            if not await self.tasks.acontains(task_id):
+                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+            return StreamingResponse(
+                self.stream_task_events(task_id),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        @self.router.post("/tasks/{task_id}/artifacts", response_model=Artifact)
+        async def upload_artifact(
+            request: Request,
+            task_id: str,
+            name: Optional[str] = None,
+            artifact_type: Optional[MessageType] = Query(None, alias="type"),
+        ):
+            if not await self.tasks.acontains(task_id):
+                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+            # 본문은 받는 대로 파일에 기록 (Content-Length가 있으면 미리 크기 확인)
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > self.artifacts.max_size:
+                self.artifacts.rejected_uploads += 1
+                raise HTTPException(status_code=413, detail="파일이 최대 크기를 넘었습니다")
+
+            name = name or "artifact"
+            content_type = request.headers.get("content-type") or guess_content_type(name)
+            try:
+                artifact = await self.artifacts.save_stream(task_id, request.stream(), name, content_type, artifact_type)
+            except ArtifactTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+
+            await self._attach_artifact(task_id, artifact)
+            return encode_response(request, artifact)
+
+        @self.router.get("/tasks/{task_id}/artifacts")
+        async def list_artifacts(request: Request, task_id: str):
+            if not await self.tasks.acontains(task_id):
+                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+            artifacts = self.artifacts.list(task_id)
+            return encode_response(request, {"artifacts": [artifact.model_dump(mode="json") for artifact in artifacts]})
+
+        @self.router.get("/tasks/{task_id}/artifacts/{artifact_id}")
+        async def download_artifact(request: Request, task_id: str, artifact_id: str):
+            if not await self.tasks.acontains(task_id):
+                raise HTTPException(status_code=404, detail="아티팩트를 찾을 수 없습니다")
+            return self.artifact_response(request, task_id, artifact_id)
+
+        @self.router.post("/callbacks")
+        async def receive_callback(task: Task):
+            # 위임한 작업의 결과를 원격 에이전트로부터 수신 (기다리는 위임 작업이 아니거나 토큰이 다르면 거절)
+            if not await self.handle_task_callback(task):
+                raise HTTPException(status_code=403, detail="기다리는 위임 작업의 콜백이 아닙니다")
+            return {"status": "accepted"}
+
+    def agent_card_response(self, request: Request) -> Response:
+        """ETag를 포함한 에이전트 카드 응답 (If-None-Match가 일치하면 304)"""
+        digest = hashlib.sha256(self.agent_card.model_dump_json().encode("utf-8")).hexdigest()[:32]
+        # 표현 형식(JSON/msgpack)마다 다른 ETag 사용
+        etag = f'"{digest}-mp"' if prefers_msgpack(request) else f'"{digest}"'
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+
+        return encode_response(request, self.agent_card, headers={"ETag": etag})
+
+    async def _attach_artifact(self, task_id: str, artifact: Artifact):
+        """업로드한 아티팩트를 가리키는 메시지를 작업에 추가 (파일 본문은 메시지에 넣지 않음)"""
+        async with self.task_locks.hold(task_id):
+            # 업로드하는 동안 작업이 제거되었을 수 있음
+            task = await self.tasks.aget(task_id)
+            if task is None:
+                await asyncio.to_thread(self.artifacts.delete_task, task_id)
+                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+            # 에이전트가 클라이언트 질문(msg_)으로 처리하지 않도록 별도 ID 접두사 사용
+            task.messages.append(Message(
+                id=f"artifact_msg_{uuid.uuid4().hex[:10]}",
+                type=MessageType(artifact.type),
+                content={"artifact_id": artifact.id, **artifact.content},
+                created_at=datetime.now(timezone.utc),
+            ))
+            task.updated_at = datetime.now(timezone.utc)
+            await self.tasks.asave(task)
+            self._notify_listeners(task)
+
+    def artifact_response(self, request: Request, task_id: str, artifact_id: str) -> Response:
+        """아티팩트 파일 응답 (Range 요청이면 해당 구간만 206으로 전송)"""
+        artifact = self.artifacts.get(task_id, artifact_id)
+        if artifact is None:
+            raise HTTPException(status_code=404, detail="아티팩트를 찾을 수 없습니다")
+
+        path = self.artifacts.path(task_id, artifact_id)
+        size = artifact.content["size"]
+        etag = f'"{artifact.content["sha256"]}"'
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        self.artifacts.downloads += 1
+
+        # If-Range가 현재 파일과 다르면 전체 파일 전송
+        range_header = request.headers.get("range")
+        if range_header and request.headers.get("if-range", etag) == etag:
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except ValueError:
+                raise HTTPException(status_code=416, detail="요청한 범위가 파일 범위를 벗어났습니다", headers={"Content-Range": f"bytes */{size}"})
+
+            if byte_range is not None:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+                headers["Content-Length"] = str(end - start + 1)
+                return StreamingResponse(
+                    iter_file(path, start, end, self.artifacts.chunk_size),
+                    status_code=206,
+                    media_type=artifact.content["content_type"],
+                    headers=headers,
+                )
+
+        # 전체 파일은 FileResponse로 전송 (서버가 지원하면 sendfile 사용)
+        return FileResponse(
+            path,
+            media_type=artifact.content["content_type"],
+            filename=artifact.content["name"],
+            headers=headers,
+        )
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """서버 상태 지표 (작업 저장소, 워커 풀 통계)"""
+        return {
+            # 외부 저장소는 작업 수 조회에 I/O가 필요하므로 스레드에서 실행
+            "task_store": await asyncio.to_thread(self.tasks.get_stats),
+            "worker_pool": self.worker_pool.get_stats(),
+            "task_locks": self.task_locks.get_stats(),
+            "idempotency": self.idempotency.get_stats(),
+            "artifacts": self.artifacts.get_stats(),
+            "sharding": self.sharding.get_stats() if self.sharding is not None else None,
+            "message_handlers": len(self.message_handlers),
+            "listeners": sum(len(listeners) for listeners in self._task_listeners.values()),
+        }
+
+    def new_task_id(self) -> str:
+        """새 작업 ID 생성 (샤딩 중이면 이 노드가 담당하는 ID)"""
+        if self.sharding is not None:
+            return self.sharding.new_task_id()
+        return f"task_{uuid.uuid4().hex[:10]}"
+
+    def _forget_task(self, task_id: str):
+        """제거된 작업의 핸들러와 버전 정보 정리 (구독자는 깨워서 종료)"""
+        self.message_handlers.pop(task_id, None)
+        self.task_versions.pop(task_id, None)
+        self._delete_artifacts(task_id)
+        for listener in self._task_listeners.get(task_id, ()):
+            listener.set()
+
+    def _delete_artifacts(self, task_id: str):
+        """작업의 아티팩트 파일을 스레드에서 삭제 (실행 중인 이벤트 루프가 없으면 바로 삭제)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.artifacts.delete_task(task_id)
+            return
+
+        cleanup = loop.create_task(asyncio.to_thread(self.artifacts.delete_task, task_id))
+        self._artifact_cleanups.add(cleanup)
+        cleanup.add_done_callback(self._artifact_cleanups.discard)
+
+    async def run_idempotent(
+        self, key: Optional[str], scope: str, payload: Any, handler: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """멱등성 키(Idempotency-Key 헤더)가 있으면 같은 키의 재시도에는 처음 처리 결과를 반환"""
+        if not key:
+            return await handler()
+
+        try:
+            return await self.idempotency.run(f"{scope}:{key}", payload, handler)
+        except IdempotencyKeyMismatchError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    async def _create_task(self, task_data: dict) -> Task:
+        """새 작업 등록 및 처리 시작"""
+        task_id = task_data.get("id") or self.new_task_id()
+
+        # 이미 존재하는 작업인지 확인
+        if await self.tasks.acontains(task_id):
+            raise HTTPException(status_code=409, detail="작업 ID가 이미 존재합니다")
+
+        task = self._build_task(task_id, task_data)
+
+        # 처리 대기열이 이 작업의 우선순위로 받을 수 있는 한도를 넘었으면 등록하지 않고 거절
+        priority = task_priority(task)
+        if self.worker_pool.is_full(priority):
+            self.worker_pool.record_rejection(priority)
+            raise self._overloaded_error()
+
+        await self.tasks.asave(task)
+        self._notify_listeners(task)
+
+        # 새 작업 생성에 대한 핸들러 호출
+        await self._admit_task(task)
+        return task
+
+    async def _add_message(self, task_id: str, message_data: dict) -> Message:
+        """작업에 메시지 추가 및 메시지 핸들러 호출"""
+        if not await self.tasks.acontains(task_id):
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+        # 새 메시지 생성
+        message_id = message_data.get("id", f"msg_{uuid.uuid4().hex[:10]}")
+        message = Message(
+            id=message_id,
+            type=message_data.get("type", MessageType.TEXT),
+            content=message_data.get("content", ""),
+            created_at=datetime.now(timezone.utc)
+        )
+
+        # 같은 작업의 메시지는 도착 순서대로 추가하고 처리
+        async with self.task_locks.hold(task_id):
+            # 잠금을 기다리는 동안 작업이 제거되었을 수 있음
+            task = await self.tasks.aget(task_id)
+            if task is None:
+                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
             # 작업에 메시지 추가
             task.messages.append(message)
             task.updated_at = datetime.now(timezone.utc)
             task.status = TaskStatus.IN_PROGRESS
+            await self.tasks.asave(task)
+            self._notify_listeners(task)
 
             # 메시지 핸들러 호출
             await self.handle_new_message(task, message)
 
-            return message
+        return message
 
-        @self.router.put("/tasks/{task_id}", response_model=Task)
-        async def update_task(task_id: str, task_update: dict):
-            if task_id not in self.tasks:
-                raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    def submit_task(
+        self,
+        handler: Callable[[Task], Awaitable[None]],
+        task: Task,
+        on_shed: Optional[Callable[[Task], None]] = None,
+    ):
+        """작업 처리 함수를 워커 풀에 등록 (대기열이 가득 차면 429)
 
-            task = self.tasks[task_id]
+        메타데이터의 우선순위와 SLA 마감 순서로 처리되며, 처리 중에는 작업 잠금을 잡으므로
+        같은 작업에 대한 메시지 처리와 겹치지 않는다. on_shed는 대기 중에 더 높은 우선순위 작업에
+        밀려 처리하지 못했을 때 작업을 실패로 표시한 뒤 호출된다.
+        """
 
-            # 상태 업데이트
-            if "status" in task_update:
-                task.status = TaskStatus(task_update["status"])
+        def shed(handler: Callable[[Task], Awaitable[None]], task: Task):
+            self._shed_task(handler, task)
+            if on_shed is not None:
+                on_shed(task)
 
-            task.updated_at = datetime.now(timezone.utc)
+        try:
+            self.worker_pool.submit(
+                self._run_locked,
+                handler,
+                task,
+                priority=task_priority(task),
+                deadline=task_deadline(task),
+                on_shed=shed,
+            )
+        except WorkerPoolFullError:
+            raise self._overloaded_error()
+
+    def _shed_task(self, handler: Callable[[Task], Awaitable[None]], task: Task):
+        """우선순위가 더 높은 작업에 밀려 처리하지 못한 작업을 실패로 표시하고 알림"""
+        task.status = TaskStatus.FAILED
+        task.updated_at = datetime.now(timezone.utc)
+        task.metadata["failure_reason"] = "overloaded"
+
+        delivery = asyncio.create_task(self.publish_task_update(task))
+        self._callback_deliveries.add(delivery)
+        delivery.add_done_callback(self._callback_deliveries.discard)
+
+    async def _run_locked(self, handler: Callable[[Task], Awaitable[None]], task: Task):
+        """작업 잠금을 잡고 처리 함수 실행"""
+        async with self.task_locks.hold(task.id):
+            await handler(task)
+
+    def _overloaded_error(self) -> HTTPException:
+        """대기열 포화 응답 (예상 대기 시간을 Retry-After로 전달)"""
+        return HTTPException(
+            status_code=429,
+            detail="작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요",
+            headers={"Retry-After": str(self.worker_pool.retry_after())},
+        )
 
-            return task
+    async def _admit_task(self, task: Task):
+        """새 작업 핸들러 호출 (거절되면 등록한 작업을 취소)"""
+        try:
+            await self.handle_new_task(task)
+        except HTTPException:
+            await self.tasks.adelete(task.id)
+            self._forget_task(task.id)
+            raise
+
+    def _build_task(self, task_id: str, task_data: dict) -> Task:
+        """요청 데이터로 새 작업 객체 생성"""
+        return Task(
+            id=task_id,
+            title=task_data.get("title", "새 작업"),
+            description=task_data.get("description", ""),
+            status=TaskStatus.CREATED,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+            metadata=task_data.get("metadata", {})
+        )
+
+    def _check_batch_size(self, size: int):
+        """일괄 요청 크기 제한 확인"""
+        if size > self.max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"일괄 요청은 최대 {self.max_batch_size}개까지 가능합니다"
+            )
 
     async def handle_new_task(self, task: Task):
         """새 작업 생성 시 호출되는 핸들러"""
@@ -114,3 +562,152 @@ class A2AServer:
     def register_message_handler(self, task_id: str, handler: Callable[[Task, Message], Awaitable[None]]):
         """특정 작업에 대한 메시지 핸들러 등록"""
         self.message_handlers[task_id] = handler
+
+    async def handle_task_callback(self, task: Task) -> bool:
+        """위임한 작업의 콜백 수신 시 호출되는 핸들러 (받은 콜백이면 True 반환)"""
+        # 하위 클래스에서 구현 (기본적으로 기다리는 위임 작업이 없으므로 모든 콜백 거절)
+        return False
+
+    async def publish_task_update(self, task: Task):
+        """작업 변경 사항을 저장하고 구독자와 등록된 콜백 URL로 전송
+
+        이 서버의 저장소에 없는 작업(웹 채팅처럼 따로 관리하는 작업)은 저장하거나 버전을 올리지 않는다.
+        """
+        if await self.tasks.acontains(task.id):
+            await self.tasks.asave(task)
+            self._notify_listeners(task)
+
+        callback_url = task.metadata.get("callback_url") if task.metadata else None
+        if not callback_url:
+            return
+
+        payload = task.model_dump(mode="json")
+        delivery = asyncio.create_task(self._deliver_callback(callback_url, payload))
+        self._callback_deliveries.add(delivery)
+        delivery.add_done_callback(self._callback_deliveries.discard)
+
+    def _notify_listeners(self, task: Task):
+        """작업 버전을 올리고 변경을 기다리는 구독자에게 알림"""
+        self.task_versions[task.id] = self.task_versions.get(task.id, 0) + 1
+        for listener in self._task_listeners.get(task.id, ()):
+            listener.set()
+
+    def _add_listener(self, task_id: str) -> asyncio.Event:
+        """작업 변경 알림을 받을 Event 등록"""
+        listener = asyncio.Event()
+        self._task_listeners.setdefault(task_id, set()).add(listener)
+        return listener
+
+    def _remove_listener(self, task_id: str, listener: asyncio.Event):
+        """작업 변경 알림 Event 등록 해제"""
+        listeners = self._task_listeners.get(task_id)
+        if listeners is not None:
+            listeners.discard(listener)
+            if not listeners:
+                del self._task_listeners[task_id]
+
+    async def wait_for_task_change(self, task_id: str, since_version: int, timeout: float) -> bool:
+        """작업 버전이 since_version보다 커질 때까지 최대 timeout초 대기"""
+        if self.task_versions.get(task_id, 0) > since_version:
+            return True
+
+        listener = self._add_listener(task_id)
+        try:
+            await asyncio.wait_for(listener.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._remove_listener(task_id, listener)
+
+    async def stream_task_events(self, task_id: str) -> AsyncIterator[str]:
+        """작업 상태 변경과 새 메시지를 SSE 형식으로 스트리밍"""
+        listener = self._add_listener(task_id)
+
+        sent_messages = 0
+        last_status = None
+        try:
+            while True:
+                task = await self.tasks.aget(task_id)
+                if task is None:
+                    break
+
+                # 마지막 전송 이후 추가된 메시지만 전송
+                for message in task.messages[sent_messages:]:
+                    yield self._format_event("message", task, message)
+                sent_messages = len(task.messages)
+
+                if task.status != last_status:
+                    last_status = task.status
+                    yield self._format_event("status", task)
+
+                if task.status in FINAL_TASK_STATUSES:
+                    break
+
+                try:
+                    await asyncio.wait_for(listener.wait(), self.event_keepalive)
+                except asyncio.TimeoutError:
+                    # 프록시의 유휴 연결 종료를 막기 위한 주석 이벤트
+                    yield ": keepalive\n\n"
+                listener.clear()
+        finally:
+            self._remove_listener(task_id, listener)
+
+    @staticmethod
+    def _format_event(event_type: str, task: Task, message: Optional[Message] = None) -> str:
+        """SSE 이벤트 문자열 생성"""
+        event = TaskEvent(
+            type=event_type,
+            task_id=task.id,
+            status=task.status,
+            updated_at=task.updated_at,
+            message=message,
+        )
+        return f"event: {event_type}\ndata: {event.model_dump_json()}\n\n"
+
+    async def _deliver_callback(self, callback_url: str, payload: dict):
+        """콜백 URL로 작업 상태 전송"""
+        if self._callback_client is None or self._callback_client.is_closed:
+            self._callback_client = httpx.AsyncClient(timeout=self.callback_timeout)
+
+        try:
+            response = await self._callback_client.post(callback_url, json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            traceback.print_exc()
+            logger.error(f"작업 콜백 전송 실패 ({payload.get('id')} -> {callback_url}): {str(e)}")
+
+    def start(self):
+        """백그라운드 작업 저장소 정리 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self._task_sweeper is None or self._task_sweeper.done():
+            self._task_sweeper = asyncio.create_task(self._sweep_tasks(), name=f"{self.agent_card.id}-task-sweeper")
+
+    async def _sweep_tasks(self):
+        """task_sweep_interval마다 TTL이 지난 작업 제거"""
+        while True:
+            await asyncio.sleep(self.task_sweep_interval)
+            try:
+                evicted = await self.tasks.aevict(force_sweep=True)
+                if evicted:
+                    logger.info(f"작업 저장소 정리: {evicted}개 제거")
+            except Exception as e:
+                traceback.print_exc()
+                logger.error(f"작업 저장소 정리 오류: {str(e)}")
+
+    async def aclose(self):
+        """워커를 멈추고 진행 중인 콜백 전송 완료 후 연결 및 작업 저장소 종료"""
+        if self._task_sweeper is not None:
+            self._task_sweeper.cancel()
+            await asyncio.gather(self._task_sweeper, return_exceptions=True)
+            self._task_sweeper = None
+        await self.worker_pool.aclose()
+        if self._callback_deliveries:
+            await asyncio.gather(*self._callback_deliveries, return_exceptions=True)
+        if self._artifact_cleanups:
+            await asyncio.gather(*self._artifact_cleanups, return_exceptions=True)
+        if self._callback_client is not None:
+            await self._callback_client.aclose()
+            self._callback_client = None
+        if self.sharding is not None:
+            await self.sharding.aclose()
+        self.tasks.close()
@@ -0,0 +1,431 @@
+"""
+A2A 작업 샤딩 모듈
+작업 ID를 일관된 해싱(consistent hashing)으로 담당 노드(워커 프로세스 또는 서버)에 배정하고,
+담당하지 않는 작업에 대한 요청은 담당 노드로 전달(forward)하거나 리다이렉트(307)합니다.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import re
+import traceback
+import uuid
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Sequence, Tuple, Union
+
+import httpx
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from a2a_protocol import codec
+
+logger = logging.getLogger(__name__)
+
+# 다른 노드가 전달한 요청 표시 (담당 노드 판단이 엇갈려도 다시 전달하지 않음)
+FORWARDED_HEADER = "x-a2a-shard-forwarded"
+
+# 전달하지 않을 연결 단위 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer", "upgrade", "host",
+}
+
+SHARD_MODES = ("forward", "redirect")
+
+
+class HashRing:
+    """가상 노드를 사용하는 일관된 해시 링 (노드가 추가/제거되어도 일부 키만 담당 노드가 바뀜)"""
+
+    def __init__(self, nodes: Iterable[str], virtual_nodes: int = 160):
+        self.nodes = sorted(set(nodes))
+        if not self.nodes:
+            raise ValueError("해시 링에 노드가 하나 이상 필요합니다")
+
+        points = sorted(
+            (self._hash(f"{node}#{index}"), node)
+            for node in self.nodes
+            for index in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def owner(self, key: str) -> str:
+        """키를 담당하는 노드"""
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class TaskSharding:
+    """작업 ID별 담당 노드 판단과 노드 간 전달 통계를 관리
+
+    nodes와 self_url은 "http://host:port" 형식의 노드 기본 URL이며, self_url은 nodes에 포함되어야 한다.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        self_url: str,
+        mode: str = "forward",
+        virtual_nodes: int = 160,
+        timeout: float = 30.0,
+    ):
+        if mode not in SHARD_MODES:
+            raise ValueError(f"지원하지 않는 샤딩 모드: {mode}")
+
+        self.ring = HashRing([node.rstrip("/") for node in nodes], virtual_nodes=virtual_nodes)
+        self.self_url = self_url.rstrip("/")
+        if self.self_url not in self.ring.nodes:
+            raise ValueError(f"샤드 노드 목록에 자신의 URL이 없습니다: {self.self_url}")
+
+        self.mode = mode
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # 요청 처리 통계
+        self.local_requests = 0
+        self.forwarded_requests = 0
+        self.redirected_requests = 0
+        self.fanout_requests = 0
+        self.forward_errors = 0
+
+    def owner(self, task_id: str) -> str:
+        """작업을 담당하는 노드 URL"""
+        return self.ring.owner(task_id)
+
+    def is_local(self, task_id: str) -> bool:
+        """이 노드가 담당하는 작업인지 확인"""
+        return self.owner(task_id) == self.self_url
+
+    def new_task_id(self) -> str:
+        """이 노드가 담당하는 새 작업 ID 생성 (이후 조회가 다른 노드로 들어와도 이 노드로 전달됨)"""
+        while True:
+            task_id = f"task_{uuid.uuid4().hex[:10]}"
+            if self.is_local(task_id):
+                return task_id
+
+    def get_client(self) -> httpx.AsyncClient:
+        """노드 간 전달에 사용할 공유 HTTP 클라이언트"""
+        if self._client is None or self._client.is_closed:
+            # 이벤트 스트림과 long-poll 응답을 기다릴 수 있도록 읽기 타임아웃은 두지 않음
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout, read=None))
+        return self._client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """노드 정보와 요청 처리 통계"""
+        return {
+            "self": self.self_url,
+            "nodes": len(self.ring.nodes),
+            "mode": self.mode,
+            "local_requests": self.local_requests,
+            "forwarded_requests": self.forwarded_requests,
+            "redirected_requests": self.redirected_requests,
+            "fanout_requests": self.fanout_requests,
+            "forward_errors": self.forward_errors,
+        }
+
+    async def aclose(self):
+        """전달용 HTTP 클라이언트 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_task_sharding(
+    nodes: Union[str, Sequence[str], None],
+    self_url: Optional[str],
+    mode: str = "forward",
+) -> Optional[TaskSharding]:
+    """노드가 둘 이상 설정되어 있으면 TaskSharding 생성 (아니면 None, 샤딩 사용 안 함)"""
+    if isinstance(nodes, str):
+        nodes = [node.strip() for node in nodes.split(",") if node.strip()]
+    if not nodes or len(nodes) < 2 or not self_url:
+        return None
+    return TaskSharding(nodes, self_url, mode=mode)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    """요청 본문 전체 읽기"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """이미 읽은 본문을 다시 전달하는 receive (그 뒤에는 원래 receive로 연결 종료 감지)"""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class ShardRouter:
+    """작업 ID를 담당하지 않는 노드로 들어온 요청을 담당 노드로 보내는 ASGI 미들웨어
+
+    - a2a_prefixes: A2A 라우터 경로 ({prefix}/tasks/{id}, 작업 생성, 일괄 생성/조회)
+    - task_prefixes: {prefix}/tasks/{id} 형식의 작업 경로만 있는 라우터
+    - create_paths: 새 작업을 만드는 경로 (Idempotency-Key가 있으면 키의 담당 노드에서 처리)
+
+    일괄 요청(tasks:batch, tasks:status)은 담당 노드별로 나눠 보낸 뒤 결과를 합친다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sharding: TaskSharding,
+        a2a_prefixes: Sequence[str] = ("/a2a",),
+        task_prefixes: Sequence[str] = (),
+        create_paths: Sequence[str] = (),
+    ):
+        self.app = app
+        self.sharding = sharding
+        self.a2a_prefixes = tuple(a2a_prefixes)
+        self.create_paths = set(create_paths) | {f"{prefix}/tasks" for prefix in self.a2a_prefixes}
+        self.batch_paths = {f"{prefix}/tasks:batch" for prefix in self.a2a_prefixes}
+        self.status_paths = {f"{prefix}/tasks:status" for prefix in self.a2a_prefixes}
+
+        prefixes = "|".join(re.escape(prefix) for prefix in (*self.a2a_prefixes, *task_prefixes))
+        self.task_path_pattern = re.compile(rf"^(?:{prefixes})/tasks/(?P<task_id>[^/:]+)(?:/.*)?$")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or FORWARDED_HEADER in Headers(scope=scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        match = self.task_path_pattern.match(path)
+        if match:
+            await self._route(match.group("task_id"), scope, receive, send)
+            return
+
+        if scope["method"] == "POST":
+            if path in self.batch_paths:
+                await self._fan_out(scope, receive, send, "tasks", ("tasks", "errors"))
+                return
+            if path in self.status_paths:
+                await self._fan_out(scope, receive, send, "task_ids", ("tasks", "missing"))
+                return
+            if path in self.create_paths:
+                # 작업 ID가 정해져 있으면 그 ID의 담당 노드, 없으면 멱등성 키의 담당 노드에서 생성
+                body = await _read_body(receive)
+                receive = _replay_body(body, receive)
+                key = self._task_id_from_body(body) or Headers(scope=scope).get("idempotency-key")
+                if key:
+                    await self._route(key, scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _task_id_from_body(body: bytes) -> Optional[str]:
+        """작업 생성 요청 본문의 작업 ID"""
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return None
+        task_id = data.get("id") if isinstance(data, dict) else None
+        return task_id if isinstance(task_id, str) and task_id else None
+
+    async def _route(self, key: str, scope: Scope, receive: Receive, send: Send):
+        """키의 담당 노드에서 요청 처리"""
+        owner = self.sharding.owner(key)
+        if owner == self.sharding.self_url:
+            self.sharding.local_requests += 1
+            await self.app(scope, receive, send)
+            return
+
+        if self.sharding.mode == "redirect":
+            self.sharding.redirected_requests += 1
+            response = RedirectResponse(self._owner_url(owner, scope), status_code=307)
+            await response(scope, receive, send)
+            return
+
+        await self._forward(owner, scope, receive, send)
+
+    @staticmethod
+    def _owner_url(owner: str, scope: Scope) -> str:
+        """담당 노드에서의 같은 요청 URL"""
+        url = f"{owner}{scope.get('root_path', '')}{scope['path']}"
+        if scope.get("query_string"):
+            url = f"{url}?{scope['query_string'].decode('latin-1')}"
+        return url
+
+    def _forward_headers(self, scope: Scope) -> List[Tuple[bytes, bytes]]:
+        """담당 노드로 보낼 요청 헤더"""
+        headers = [(name, value) for name, value in scope["headers"] if name.decode("latin-1") not in HOP_BY_HOP_HEADERS]
+        headers.append((FORWARDED_HEADER.encode("latin-1"), self.sharding.self_url.encode("latin-1")))
+        return headers
+
+    async def _forward(self, owner: str, scope: Scope, receive: Receive, send: Send):
+        """요청을 담당 노드로 전달하고 응답을 그대로 스트리밍 (본문과 Content-Encoding 유지)"""
+        request_headers = Headers(scope=scope)
+        has_body = "content-length" in request_headers or "transfer-encoding" in request_headers
+
+        async def request_body() -> AsyncIterator[bytes]:
+            while True:
+                message = await receive()
+                if message["type"] != "http.request":
+                    break
+                yield message.get("body", b"")
+                if not message.get("more_body", False):
+                    break
+
+        client = self.sharding.get_client()
+        request = client.build_request(
+            scope["method"],
+            self._owner_url(owner, scope),
+            headers=self._forward_headers(scope),
+            content=request_body() if has_body else None,
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TransportError as e:
+            self.sharding.forward_errors += 1
+            logger.error(f"담당 노드 {owner}로 요청을 전달하지 못했습니다: {str(e)}")
+            error = JSONResponse(
+                {"detail": "작업 담당 노드에 연결할 수 없습니다"}, status_code=503, headers={"Retry-After": "1"}
+            )
+            await error(scope, receive, send)
+            return
+
+        self.sharding.forwarded_requests += 1
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name.lower(), value)
+                    for name, value in response.headers.raw
+                    if name.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+                ],
+            })
+
+            # 클라이언트 연결이 끊기면 담당 노드 응답(이벤트 스트림 등)도 중단
+            relay = asyncio.create_task(self._relay_body(response, send))
+            disconnect = asyncio.create_task(self._wait_for_disconnect(receive))
+            done, pending = await asyncio.wait({relay, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+            if relay in done:
+                relay.result()
+        finally:
+            await response.aclose()
+
+    @staticmethod
+    async def _relay_body(response: httpx.Response, send: Send):
+        async for chunk in response.aiter_raw():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _wait_for_disconnect(receive: Receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def _fan_out(self, scope: Scope, receive: Receive, send: Send, items_key: str, result_keys: Tuple[str, str]):
+        """일괄 요청을 담당 노드별로 나눠 처리하고 결과 합치기"""
+        body = await _read_body(receive)
+        try:
+            data = json.loads(body or b"{}")
+            items = data.get(items_key, [])
+            if not isinstance(items, list):
+                raise ValueError(f"{items_key}는 목록이어야 합니다")
+        except (ValueError, AttributeError):
+            # 형식 검증과 오류 응답은 이 노드의 라우트에 맡김
+            await self.app(scope, _replay_body(body, receive), send)
+            return
+
+        # 작업 ID가 없는 항목은 이 노드에서 새 ID로 생성
+        groups: Dict[str, list] = {}
+        for item in items:
+            task_id = item.get("id") if isinstance(item, dict) else item
+            owner = self.sharding.owner(task_id) if isinstance(task_id, str) and task_id else self.sharding.self_url
+            groups.setdefault(owner, []).append(item)
+        self.sharding.fanout_requests += 1
+
+        owners = list(groups) or [self.sharding.self_url]
+        responses = await asyncio.gather(*(
+            self._call_shard(owner, scope, {**data, items_key: groups.get(owner, [])}) for owner in owners
+        ))
+
+        merged: Dict[str, list] = {key: [] for key in result_keys}
+        for owner, (status_code, payload) in zip(owners, responses):
+            if status_code == 200:
+                for key in result_keys:
+                    merged[key].extend(payload.get(key, []))
+            elif items_key == "tasks":
+                # 처리하지 못한 노드의 작업은 항목별 오류로 반환
+                detail = payload.get("detail", "작업 담당 노드에서 처리하지 못했습니다")
+                merged["errors"].extend(
+                    {"id": item.get("id") if isinstance(item, dict) else None, "status_code": status_code, "detail": detail}
+                    for item in groups.get(owner, [])
+                )
+            else:
+                error = JSONResponse(payload or {"detail": "작업 담당 노드에 연결할 수 없습니다"}, status_code=status_code)
+                await error(scope, receive, send)
+                return
+
+        response = codec.encode_response(Request(scope), merged)
+        await response(scope, receive, send)
+
+    async def _call_shard(self, owner: str, scope: Scope, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """담당 노드(자신이면 현재 앱)에 JSON 요청을 보내고 (상태 코드, 응답 JSON) 반환"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if owner == self.sharding.self_url:
+            return await self._call_local(scope, body)
+
+        client = self.sharding.get_client()
+        headers = {"Content-Type": "application/json", "Accept": "application/json", FORWARDED_HEADER: self.sharding.self_url}
+        try:
+            response = await client.post(self._owner_url(owner, scope), content=body, headers=headers)
+            return response.status_code, response.json()
+        except (httpx.TransportError, ValueError) as e:
+            traceback.print_exc()
+            self.sharding.forward_errors += 1
+            return 503, {"detail": f"작업 담당 노드에 연결할 수 없습니다: {str(e)}"}
+
+    async def _call_local(self, scope: Scope, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """현재 앱에 JSON 요청을 보내고 응답 수집"""
+        headers = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-length", b"accept", b"accept-encoding", b"content-type")
+        ]
+        headers += [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+            (b"accept", b"application/json"),
+        ]
+        status_code = 500
+        chunks = []
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app({**scope, "headers": headers}, receive, send)
+        try:
+            return status_code, json.loads(b"".join(chunks) or b"{}")
+        except ValueError:
+            return status_code, {}
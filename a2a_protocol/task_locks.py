@@ -0,0 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator
+
+
+class TaskLocks:
+    """작업 ID별 FIFO 잠금 (같은 작업의 처리는 도착 순서대로, 다른 작업은 동시에 진행)"""
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, int] = {}
+        self.contended = 0
+
+    @asynccontextmanager
+    async def hold(self, task_id: str) -> AsyncIterator[None]:
+        """작업 잠금 획득 (asyncio.Lock은 대기 순서대로 깨움)"""
+        lock = self._locks.get(task_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[task_id] = lock
+        if lock.locked():
+            self.contended += 1
+
+        self._holders[task_id] = self._holders.get(task_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            # 기다리는 쪽이 없으면 잠금 객체 정리
+            self._holders[task_id] -= 1
+            if not self._holders[task_id]:
+                del self._holders[task_id]
+                del self._locks[task_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """잠금 사용 통계"""
+        return {
+            "locked_tasks": len(self._locks),
+            "waiting": sum(self._holders.values()) - sum(1 for lock in self._locks.values() if lock.locked()),
+            "contended": self.contended,
+        }
@@ -0,0 +1,612 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+from a2a_protocol.models import Task, Message, TaskStatus, FINAL_TASK_STATUSES
+
+
+class TaskStore(MutableMapping, ABC):
+    """A2AServer 작업 저장소 인터페이스 (dict처럼 사용)
+
+    저장소에서 꺼낸 작업 객체를 직접 변경한 뒤에는 save()로 변경 사항을 반영한다.
+    이벤트 루프에서는 외부 저장소 I/O가 루프를 막지 않도록 aget/acontains/asave/adelete/aevict를 사용한다.
+    """
+
+    @abstractmethod
+    def save(self, task: Task):
+        """작업 변경 사항 저장"""
+
+    @abstractmethod
+    def add_eviction_listener(self, listener: Callable[[str], None]):
+        """작업이 제거될 때 호출할 함수 등록 (작업 ID 전달)"""
+
+    async def aget(self, task_id: str) -> Optional[Task]:
+        """작업 조회 (없으면 None)"""
+        return self.get(task_id)
+
+    async def acontains(self, task_id: str) -> bool:
+        """작업 존재 여부 확인"""
+        return task_id in self
+
+    async def asave(self, task: Task):
+        """작업 추가 또는 변경 사항 저장"""
+        self[task.id] = task
+
+    async def adelete(self, task_id: str):
+        """작업 삭제 (없으면 무시)"""
+        self.pop(task_id, None)
+
+    def evict(self, force_sweep: bool = False, keep: Optional[str] = None) -> int:
+        """제거 대상 작업 정리 (제거한 작업 수 반환)"""
+        return 0
+
+    async def aevict(self, force_sweep: bool = False) -> int:
+        """제거 대상 작업 정리 (제거한 작업 수 반환)"""
+        return self.evict(force_sweep=force_sweep)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        return {"tasks": len(self)}
+
+    def close(self):
+        """저장소 자원 정리"""
+        pass
+
+
+class InMemoryTaskStore(TaskStore):
+    """작업 수 상한과 TTL을 적용하는 메모리 작업 저장소 (dict와 호환)
+
+    끝난 작업(COMPLETED/FAILED/CANCELLED)은 마지막 변경 후 finished_ttl초가 지나면 제거하고,
+    작업 수가 max_tasks를 넘으면 가장 오래 사용되지 않은 끝난 작업부터 제거한다.
+    끝나지 않은 작업은 상한을 넘어도 유지하되, idle_ttl초 동안 변경이 없으면 제거한다 (0이면 유지).
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        max_tasks: int = 10000,
+        finished_ttl: float = 3600.0,
+        sweep_interval: float = 60.0,
+        idle_ttl: float = 86400.0,
+    ):
+        self.max_tasks = max_tasks
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()
+        self._eviction_listeners: List[Callable[[str], None]] = []
+        self._last_sweep = time.monotonic()
+
+        # 제거 통계
+        self.evicted_by_ttl = 0
+        self.evicted_by_lru = 0
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._tasks[task_id]
+        self._tasks.move_to_end(task_id)
+        return task
+
+    def __setitem__(self, task_id: str, task: Task):
+        self._tasks[task_id] = task
+        self._tasks.move_to_end(task_id)
+        self.evict(keep=task_id)
+
+    def __delitem__(self, task_id: str):
+        del self._tasks[task_id]
+
+    def __contains__(self, task_id: object) -> bool:
+        # 존재 확인은 사용 순서를 바꾸지 않음
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tasks))
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def save(self, task: Task):
+        """메모리 저장소는 객체를 그대로 보관하므로 별도 저장이 필요 없음"""
+        pass
+
+    def add_eviction_listener(self, listener: Callable[[str], None]):
+        """작업이 제거될 때 호출할 함수 등록 (작업 ID 전달)"""
+        self._eviction_listeners.append(listener)
+
+    def _is_finished(self, task: Task) -> bool:
+        """끝난 작업인지 확인"""
+        return task.status in FINAL_TASK_STATUSES
+
+    def _is_expired(self, task: Task, now: datetime) -> bool:
+        """끝난 뒤 TTL이 지났거나 끝나지 않은 채 idle_ttl 동안 변경이 없는 작업인지 확인"""
+        updated_at = task.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        age = (now - updated_at).total_seconds()
+        if self._is_finished(task):
+            return age > self.finished_ttl
+        return self.idle_ttl > 0 and age > self.idle_ttl
+
+    def _expired_task_ids(self) -> List[str]:
+        """TTL이 지난 작업 ID 목록"""
+        now = datetime.now(timezone.utc)
+        return [task_id for task_id, task in self._tasks.items() if self._is_expired(task, now)]
+
+    def _evict_task(self, task_id: str, expired: bool):
+        """작업 제거 및 제거 알림"""
+        self._tasks.pop(task_id, None)
+        for listener in self._eviction_listeners:
+            listener(task_id)
+
+    def _sweep_due(self, force_sweep: bool) -> bool:
+        """TTL 검사를 할 차례인지 확인 (전체 작업을 훑으므로 sweep_interval마다 한 번만 수행)"""
+        if force_sweep or time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = time.monotonic()
+            return True
+        return False
+
+    def evict(self, force_sweep: bool = False, keep: Optional[str] = None) -> int:
+        """TTL이 지난 작업과 상한을 넘은 끝난 작업 제거 (제거한 작업 수 반환)"""
+        evicted = 0
+
+        if self._sweep_due(force_sweep):
+            for task_id in self._expired_task_ids():
+                self._evict_task(task_id, expired=True)
+                self.evicted_by_ttl += 1
+                evicted += 1
+
+        return evicted + self._evict_overflow(keep)
+
+    def _evict_overflow(self, keep: Optional[str] = None) -> int:
+        """상한 초과분을 가장 오래 사용되지 않은 끝난 작업부터 제거 (제거한 작업 수 반환)"""
+        evicted = 0
+        overflow = len(self._tasks) - self.max_tasks
+        if overflow > 0:
+            candidates = []
+            for task_id, task in self._tasks.items():
+                # 방금 저장한 작업은 상한 초과로 제거하지 않음
+                if task_id != keep and self._is_finished(task):
+                    candidates.append(task_id)
+                    if len(candidates) >= overflow:
+                        break
+            for task_id in candidates:
+                self._evict_task(task_id, expired=False)
+                self.evicted_by_lru += 1
+                evicted += 1
+
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 크기와 제거 통계"""
+        return {
+            "backend": self.backend,
+            "tasks": len(self),
+            "cached_tasks": len(self._tasks),
+            "max_tasks": self.max_tasks,
+            "finished_ttl": self.finished_ttl,
+            "idle_ttl": self.idle_ttl,
+            "evicted_by_ttl": self.evicted_by_ttl,
+            "evicted_by_lru": self.evicted_by_lru,
+        }
+
+
+class SQLiteTaskStore(InMemoryTaskStore):
+    """SQLite에 작업을 영속화하는 저장소
+
+    메시지는 추가된 것만 기록(append-only)하고, 작업은 처음 조회될 때 DB에서 불러온다.
+    같은 DB 파일과 namespace를 사용하는 여러 프로세스(복제본)가 작업을 공유할 수 있으며,
+    조회 시 revision을 비교하여 다른 프로세스가 변경한 작업은 다시 불러와 캐시된 객체를 갱신한다.
+    aget/acontains/asave/adelete/aevict는 DB 조회와 기록을 스레드에서 실행한다.
+    메모리에는 최대 max_tasks개의 작업만 캐시하고, TTL이 지난 작업은 DB에서도 삭제한다.
+    """
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "default",
+        max_tasks: int = 10000,
+        finished_ttl: float = 3600.0,
+        sweep_interval: float = 60.0,
+        idle_ttl: float = 86400.0,
+    ):
+        super().__init__(
+            max_tasks=max_tasks, finished_ttl=finished_ttl, sweep_interval=sweep_interval, idle_ttl=idle_ttl
+        )
+        self.path = path
+        self.namespace = namespace
+
+        # 캐시된 작업의 DB revision과 이미 기록된 메시지 수
+        self._revisions: Dict[str, int] = {}
+        self._persisted_messages: Dict[str, int] = {}
+
+        # 하나의 연결을 이벤트 루프와 스레드에서 함께 쓰므로 DB 작업은 잠금 안에서 실행
+        self._db_lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._create_tables_if_not_exist()
+
+    def _create_tables_if_not_exist(self):
+        """필요한 테이블이 없으면 생성"""
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS a2a_tasks (
+            namespace TEXT NOT NULL,
+            id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            updated_ts REAL NOT NULL,
+            metadata TEXT, -- JSON 형식으로 저장
+            revision INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (namespace, id)
+        )
+        """)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS a2a_task_messages (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            namespace TEXT NOT NULL,
+            task_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            type TEXT NOT NULL,
+            content TEXT NOT NULL, -- JSON 형식으로 저장
+            created_at TEXT NOT NULL,
+            UNIQUE (namespace, task_id, id)
+        )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_a2a_tasks_status ON a2a_tasks (namespace, status, updated_ts)"
+        )
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._apply_read(task_id, *self._read_if_changed(task_id, self._cached_revision(task_id)))
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    async def aget(self, task_id: str) -> Optional[Task]:
+        """DB 조회를 스레드에서 실행하여 작업 조회 (없으면 None)"""
+        revision, loaded = await asyncio.to_thread(self._read_if_changed, task_id, self._cached_revision(task_id))
+        return self._apply_read(task_id, revision, loaded)
+
+    def _cached_revision(self, task_id: str) -> Optional[int]:
+        """캐시된 작업의 revision (캐시되지 않았으면 None)"""
+        return self._revisions.get(task_id) if task_id in self._tasks else None
+
+    def _read_if_changed(self, task_id: str, cached_revision: Optional[int]) -> Tuple[Optional[int], Optional[Task]]:
+        """DB의 revision과 (캐시와 다르면) 작업 전체 조회"""
+        with self._db_lock:
+            revision = self._get_revision(task_id)
+            if revision is None or revision == cached_revision:
+                return revision, None
+            try:
+                return revision, self._load(task_id)
+            except KeyError:
+                # revision 조회와 작업 조회 사이에 다른 프로세스가 삭제한 경우
+                return None, None
+
+    def _apply_read(self, task_id: str, revision: Optional[int], loaded: Optional[Task]) -> Optional[Task]:
+        """조회 결과를 캐시에 반영하고 캐시된 작업 반환"""
+        if revision is None:
+            self._forget_cached(task_id)
+            return None
+
+        # 조회하는 동안 이 프로세스가 더 새로운 revision을 기록했으면 캐시를 유지
+        if loaded is not None and revision > self._revisions.get(task_id, 0):
+            self._refresh_cached(task_id, loaded, revision)
+
+        task = self._tasks.get(task_id)
+        if task is None:
+            # 조회하는 동안 캐시에서 밀려난 경우 다시 불러옴
+            revision, loaded = self._read_if_changed(task_id, None)
+            if revision is None:
+                return None
+            self._refresh_cached(task_id, loaded, revision)
+            task = self._tasks[task_id]
+
+        self._tasks.move_to_end(task_id)
+        return task
+
+    def _refresh_cached(self, task_id: str, loaded: Task, revision: int):
+        """DB에서 불러온 내용으로 캐시 갱신
+
+        이미 캐시된 작업은 객체를 바꾸지 않고 내용만 갱신하여, 그 객체를 들고 있는 처리 코드의
+        이후 변경과 save()가 유실되지 않게 한다.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            self._tasks[task_id] = loaded
+        else:
+            for field in Task.model_fields:
+                setattr(task, field, getattr(loaded, field))
+        self._revisions[task_id] = revision
+        self._persisted_messages[task_id] = len(loaded.messages)
+        self._tasks.move_to_end(task_id)
+        self._evict_overflow(keep=task_id)
+
+    def __setitem__(self, task_id: str, task: Task):
+        # 이미 캐시된 같은 객체는 이후 save()에서 반영되므로 다시 기록하지 않음
+        if self._tasks.get(task_id) is not task:
+            self.save(task)
+        super().__setitem__(task_id, task)
+
+    def __delitem__(self, task_id: str):
+        self._delete_rows([task_id])
+        self._forget_cached(task_id)
+
+    async def adelete(self, task_id: str):
+        """DB 삭제를 스레드에서 실행하여 작업 삭제"""
+        await asyncio.to_thread(self._delete_rows, [task_id])
+        self._forget_cached(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks or self._get_revision(task_id) is not None
+
+    async def acontains(self, task_id: str) -> bool:
+        """캐시에 없으면 DB 조회를 스레드에서 실행하여 존재 여부 확인"""
+        return task_id in self._tasks or await asyncio.to_thread(self._get_revision, task_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT id FROM a2a_tasks WHERE namespace = ?", (self.namespace,)).fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM a2a_tasks WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def save(self, task: Task):
+        """작업 행을 갱신하고 아직 기록되지 않은 메시지만 추가"""
+        row, message_rows = self._save_params(task)
+        cached_revision = self._cached_revision(task.id)
+        self._saved(task, len(task.messages), cached_revision, self._write(row, message_rows))
+
+    async def asave(self, task: Task):
+        """기록할 값은 이벤트 루프에서 만들고 DB 기록만 스레드에서 실행 (처음 저장하는 작업은 캐시에 추가)"""
+        row, message_rows = self._save_params(task)
+        message_count = len(task.messages)
+        cached_revision = self._cached_revision(task.id)
+        revision = await asyncio.to_thread(self._write, row, message_rows)
+
+        if self._tasks.get(task.id) is not task:
+            self._tasks[task.id] = task
+        self._saved(task, message_count, cached_revision, revision)
+        self._tasks.move_to_end(task.id)
+        self._evict_overflow(keep=task.id)
+
+    def _save_params(self, task: Task) -> Tuple[tuple, List[tuple]]:
+        """작업 행과 아직 기록되지 않은 메시지 행"""
+        persisted = self._persisted_messages.get(task.id, 0)
+        updated_at = task.updated_at if task.updated_at.tzinfo else task.updated_at.replace(tzinfo=timezone.utc)
+        row = (
+            self.namespace,
+            task.id,
+            task.title,
+            task.description,
+            TaskStatus(task.status).value,
+            task.created_at.isoformat(),
+            task.updated_at.isoformat(),
+            updated_at.timestamp(),
+            json.dumps(task.metadata, ensure_ascii=False, default=str),
+        )
+        message_rows = [
+            (
+                self.namespace,
+                task.id,
+                message.id,
+                message.type.value if hasattr(message.type, "value") else str(message.type),
+                json.dumps(message.content, ensure_ascii=False),
+                message.created_at.isoformat(),
+            )
+            for message in task.messages[persisted:]
+        ]
+        return row, message_rows
+
+    def _saved(self, task: Task, message_count: int, cached_revision: Optional[int], revision: int):
+        """기록한 메시지 수와 revision 반영
+
+        새 revision이 기록 전 revision의 바로 다음이 아니면 그 사이에 다른 프로세스가 작업을 변경한 것이므로,
+        캐시된 revision을 지워 다음 조회 때 DB에서 다시 불러와 캐시된 객체를 갱신하게 한다.
+        """
+        self._persisted_messages[task.id] = max(self._persisted_messages.get(task.id, 0), message_count)
+        if task.id not in self._tasks:
+            return
+        if revision == (cached_revision or 0) + 1:
+            self._revisions[task.id] = max(self._revisions.get(task.id, 0), revision)
+        else:
+            self._revisions.pop(task.id, None)
+
+    def _write(self, row: tuple, message_rows: List[tuple]) -> int:
+        """작업 행과 메시지 행을 한 트랜잭션으로 기록하고 새 revision 반환"""
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                revision = self._conn.execute(
+                    """
+                    INSERT INTO a2a_tasks
+                        (namespace, id, title, description, status, created_at, updated_at, updated_ts, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (namespace, id) DO UPDATE SET
+                        title = excluded.title,
+                        description = excluded.description,
+                        status = excluded.status,
+                        updated_at = excluded.updated_at,
+                        updated_ts = excluded.updated_ts,
+                        metadata = excluded.metadata,
+                        revision = a2a_tasks.revision + 1
+                    RETURNING revision
+                    """,
+                    row,
+                ).fetchone()[0]
+
+                if message_rows:
+                    self._conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO a2a_task_messages (namespace, task_id, id, type, content, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        message_rows,
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return revision
+
+    def _get_revision(self, task_id: object) -> Optional[int]:
+        """DB에 저장된 작업 revision (없으면 None)"""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT revision FROM a2a_tasks WHERE namespace = ? AND id = ?", (self.namespace, task_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _load(self, task_id: str) -> Task:
+        """DB에서 작업과 메시지를 불러옴"""
+        with self._db_lock:
+            row = self._conn.execute(
+                """
+                SELECT id, title, description, status, created_at, updated_at, metadata
+                FROM a2a_tasks WHERE namespace = ? AND id = ?
+                """,
+                (self.namespace, task_id),
+            ).fetchone()
+            if row is None:
+                raise KeyError(task_id)
+
+            message_rows = self._conn.execute(
+                """
+                SELECT id, type, content, created_at FROM a2a_task_messages
+                WHERE namespace = ? AND task_id = ? ORDER BY seq
+                """,
+                (self.namespace, task_id),
+            ).fetchall()
+
+        messages = [
+            Message(
+                id=message_id,
+                type=message_type,
+                content=json.loads(content),
+                created_at=datetime.fromisoformat(created_at),
+            )
+            for message_id, message_type, content, created_at in message_rows
+        ]
+
+        return Task(
+            id=row[0],
+            title=row[1],
+            description=row[2] or "",
+            status=TaskStatus(row[3]),
+            created_at=datetime.fromisoformat(row[4]),
+            updated_at=datetime.fromisoformat(row[5]),
+            messages=messages,
+            metadata=json.loads(row[6]) if row[6] else {},
+        )
+
+    def _delete_rows(self, task_ids: List[str]):
+        """작업과 메시지 행 삭제"""
+        params = [(self.namespace, task_id) for task_id in task_ids]
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM a2a_task_messages WHERE namespace = ? AND task_id = ?", params)
+                self._conn.executemany("DELETE FROM a2a_tasks WHERE namespace = ? AND id = ?", params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _forget_cached(self, task_id: str):
+        """메모리 캐시에서 작업 제거"""
+        self._tasks.pop(task_id, None)
+        self._revisions.pop(task_id, None)
+        self._persisted_messages.pop(task_id, None)
+
+    def _expired_task_ids(self) -> List[str]:
+        """TTL이 지난 작업 ID 목록 (캐시되지 않은 작업 포함)"""
+        statuses = [status.value for status in FINAL_TASK_STATUSES]
+        placeholders = ", ".join("?" for _ in statuses)
+        now = time.time()
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT id FROM a2a_tasks
+                WHERE namespace = ? AND status IN ({placeholders}) AND updated_ts < ?
+                """,
+                (self.namespace, *statuses, now - self.finished_ttl),
+            ).fetchall()
+            if self.idle_ttl > 0:
+                rows += self._conn.execute(
+                    f"""
+                    SELECT id FROM a2a_tasks
+                    WHERE namespace = ? AND status NOT IN ({placeholders}) AND updated_ts < ?
+                    """,
+                    (self.namespace, *statuses, now - self.idle_ttl),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def _evict_task(self, task_id: str, expired: bool):
+        """TTL이 지난 작업은 DB에서도 삭제하고, 상한 초과 작업은 메모리 캐시에서만 제거"""
+        if not expired:
+            self._forget_cached(task_id)
+            return
+
+        self._delete_rows([task_id])
+        self._forget_cached(task_id)
+        for listener in self._eviction_listeners:
+            listener(task_id)
+
+    def _delete_expired(self) -> List[str]:
+        """TTL이 지난 작업을 DB에서 삭제하고 삭제한 작업 ID 반환"""
+        with self._db_lock:
+            task_ids = self._expired_task_ids()
+            if task_ids:
+                self._delete_rows(task_ids)
+        return task_ids
+
+    async def aevict(self, force_sweep: bool = False) -> int:
+        """TTL이 지난 작업의 DB 조회와 삭제는 스레드에서 실행하고, 캐시 정리와 제거 알림은 이벤트 루프에서 실행"""
+        evicted = 0
+
+        if self._sweep_due(force_sweep):
+            for task_id in await asyncio.to_thread(self._delete_expired):
+                self._forget_cached(task_id)
+                for listener in self._eviction_listeners:
+                    listener(task_id)
+                self.evicted_by_ttl += 1
+                evicted += 1
+
+        return evicted + self._evict_overflow()
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._db_lock:
+            self._conn.close()
+
+
+def create_task_store(
+    path: Optional[str] = None,
+    namespace: str = "default",
+    max_tasks: int = 10000,
+    finished_ttl: float = 3600.0,
+    idle_ttl: float = 86400.0,
+) -> TaskStore:
+    """경로가 있으면 SQLite 저장소, 없으면 메모리 저장소 생성"""
+    if path:
+        return SQLiteTaskStore(
+            path, namespace=namespace, max_tasks=max_tasks, finished_ttl=finished_ttl, idle_ttl=idle_ttl
+        )
+    return InMemoryTaskStore(max_tasks=max_tasks, finished_ttl=finished_ttl, idle_ttl=idle_ttl)
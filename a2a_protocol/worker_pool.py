@@ -0,0 +1,218 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+import traceback
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from a2a_protocol.priority import PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_NAMES
+from a2a_protocol.resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# 우선순위별로 받을 수 있는 대기열 사용률 (넘으면 낮은 우선순위부터 거절)
+DEFAULT_ADMISSION_LIMITS = {PRIORITY_HIGH: 1.0, PRIORITY_NORMAL: 0.9, PRIORITY_LOW: 0.5}
+
+
+class WorkerPoolFullError(Exception):
+    """작업 대기열이 가득 차 새 작업을 받을 수 없는 경우 발생하는 예외"""
+
+
+class _PriorityStats:
+    """우선순위별 처리 통계"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.shed = 0
+        self.wait_times = LatencyTracker(window_size=1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "wait_p50": self.wait_times.get_percentile(0.5),
+            "wait_p95": self.wait_times.get_percentile(0.95),
+            "wait_p99": self.wait_times.get_percentile(0.99),
+        }
+
+
+class WorkerPool:
+    """고정된 수의 워커와 크기가 제한된 우선순위 대기열로 비동기 작업을 처리하는 풀
+
+    대기열에서는 우선순위가 높은 작업이 먼저 처리되고, 같은 우선순위에서는 SLA 마감이 빠른 작업,
+    그다음 먼저 들어온 작업 순서로 처리된다. 대기열이 차오르면 낮은 우선순위 작업부터 거절하며,
+    가득 찬 상태에서 더 높은 우선순위 작업이 들어오면 가장 낮은 우선순위 작업을 밀어낸다(on_shed 호출).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 32,
+        max_queue_size: int = 1000,
+        admission_limits: Optional[Dict[int, float]] = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.admission_limits = admission_limits or DEFAULT_ADMISSION_LIMITS
+        self._heap: List[Tuple] = []
+        self._sequence = itertools.count()
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self.busy_workers = 0
+
+        # 처리 통계 (대기 시간과 처리 시간 분포)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.shed = 0
+        self.wait_times = LatencyTracker(window_size=1000)
+        self.service_times = LatencyTracker(window_size=1000)
+        self.priority_stats = {priority: _PriorityStats() for priority in PRIORITY_NAMES}
+
+    def _start(self):
+        """워커 생성 (실행 중인 이벤트 루프에서 처음 등록될 때)"""
+        self._ready = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+
+    def _find_sheddable(self, priority: int) -> Optional[int]:
+        """priority보다 낮은 우선순위 중 가장 나중에 처리될 작업의 위치"""
+        candidates = [index for index, item in enumerate(self._heap) if item[0] > priority]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda index: self._heap[index][:3])
+
+    def is_full(self, priority: int = PRIORITY_NORMAL) -> bool:
+        """해당 우선순위의 작업을 더 받을 수 없는지 확인"""
+        limit = int(self.max_queue_size * self.admission_limits.get(priority, 1.0))
+        if len(self._heap) < limit:
+            return False
+        return self._find_sheddable(priority) is None
+
+    def record_rejection(self, priority: int = PRIORITY_NORMAL):
+        """대기열에 넣기 전에 거절한 작업 기록"""
+        self.rejected += 1
+        self.priority_stats.setdefault(priority, _PriorityStats()).rejected += 1
+
+    def submit(
+        self,
+        handler: Callable[..., Awaitable[None]],
+        *args: Any,
+        priority: int = PRIORITY_NORMAL,
+        deadline: Optional[float] = None,
+        on_shed: Optional[Callable[..., None]] = None,
+    ):
+        """처리 함수를 대기열에 등록 (받을 수 없으면 WorkerPoolFullError)
+
+        on_shed는 대기 중이던 작업이 더 높은 우선순위 작업에 밀려 제거될 때 같은 인자로 호출된다.
+        """
+        if self._ready is None:
+            self._start()
+
+        stats = self.priority_stats.setdefault(priority, _PriorityStats())
+        shed_item = None
+        limit = int(self.max_queue_size * self.admission_limits.get(priority, 1.0))
+        if len(self._heap) >= limit:
+            shed_index = self._find_sheddable(priority)
+            if shed_index is None:
+                self.record_rejection(priority)
+                raise WorkerPoolFullError(f"{self.name} 작업 대기열이 가득 찼습니다 ({len(self._heap)}/{self.max_queue_size}개)")
+
+            # 가장 낮은 우선순위 작업을 밀어내고 자리 확보
+            shed_item = self._heap[shed_index]
+            self._heap[shed_index] = self._heap[-1]
+            self._heap.pop()
+            heapq.heapify(self._heap)
+
+        # 마감이 없는 작업은 같은 우선순위에서 마감이 있는 작업 뒤에 처리
+        item = (priority, deadline if deadline is not None else math.inf, next(self._sequence), time.monotonic(), handler, args, on_shed)
+        heapq.heappush(self._heap, item)
+        self.submitted += 1
+        stats.submitted += 1
+
+        if shed_item is None:
+            self._ready.release()
+        else:
+            self._on_shed(shed_item)
+
+    def _on_shed(self, item: Tuple):
+        """밀려난 작업 통계 기록 및 알림"""
+        priority, _, _, _, handler, args, on_shed = item
+        self.shed += 1
+        self.priority_stats[priority].shed += 1
+        logger.warning(f"{self.name} 대기열 포화로 {PRIORITY_NAMES.get(priority, priority)} 우선순위 작업을 제외합니다")
+        if on_shed is not None:
+            try:
+                on_shed(*args)
+            except Exception as e:
+                traceback.print_exc()
+                logger.error(f"{self.name} 제외 작업 알림 오류: {str(e)}")
+
+    async def _worker(self):
+        """대기열에서 우선순위가 가장 높은 작업을 꺼내 처리"""
+        while True:
+            await self._ready.acquire()
+            priority, _, _, enqueued_at, handler, args, _ = heapq.heappop(self._heap)
+            started_at = time.monotonic()
+            self.wait_times.record(started_at - enqueued_at)
+            self.priority_stats[priority].wait_times.record(started_at - enqueued_at)
+            self.busy_workers += 1
+            try:
+                await handler(*args)
+                self.completed += 1
+                self.priority_stats[priority].completed += 1
+            except Exception as e:
+                traceback.print_exc()
+                logger.error(f"{self.name} 작업 처리 오류: {str(e)}")
+                self.failed += 1
+            finally:
+                self.busy_workers -= 1
+                self.service_times.record(time.monotonic() - started_at)
+
+    def retry_after(self) -> int:
+        """대기열이 비워질 때까지의 예상 시간 (Retry-After 헤더 값, 초)"""
+        service_time = self.service_times.get_percentile(0.5) or 1.0
+        return max(1, min(60, math.ceil(len(self._heap) * service_time / self.max_workers)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """대기열 깊이와 대기/처리 시간 통계 (우선순위별 통계 포함)"""
+        return {
+            "workers": self.max_workers,
+            "busy_workers": self.busy_workers,
+            "queue_depth": len(self._heap),
+            "max_queue_size": self.max_queue_size,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "wait_p50": self.wait_times.get_percentile(0.5),
+            "wait_p95": self.wait_times.get_percentile(0.95),
+            "wait_p99": self.wait_times.get_percentile(0.99),
+            "service_p50": self.service_times.get_percentile(0.5),
+            "service_p95": self.service_times.get_percentile(0.95),
+            "priorities": {
+                PRIORITY_NAMES.get(priority, str(priority)): stats.get_stats()
+                for priority, stats in self.priority_stats.items()
+            },
+        }
+
+    async def aclose(self):
+        """워커 종료"""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._heap = []
+        self._ready = None
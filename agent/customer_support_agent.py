@@ -1,37 +1,92 @@
 import traceback
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Set, Tuple
 import asyncio
 import logging
 
 from a2a_protocol.models import Task, Message, TaskStatus, MessageType
+from a2a_protocol.card_cache import AgentCardCache
 from a2a_protocol.client import A2AClient
+from a2a_protocol.resilience import CircuitOpenError
 from a2a_protocol.server import A2AServer
+from a2a_protocol.priority import priority_metadata
+from a2a_protocol.sharding import TaskSharding
+from a2a_protocol.task_store import create_task_store
 from agent.agent_card import create_agent_card
 from agent.knowledge_base import get_faq_answer, get_product_info, get_troubleshooting_tip
-from utils.llm_utils import generate_response, categorize_query
-from config import PRODUCT_AGENT_URL, SHIPPING_AGENT_URL, BILLING_AGENT_URL
+from utils.llm_utils import (
+    generate_response, stream_response, categorize_query, close_llm_client, load_query_classifier,
+    LLMStreamInterruptedError,
+)
+from config import (
+    PRODUCT_AGENT_URLS, SHIPPING_AGENT_URLS, BILLING_AGENT_URLS,
+    A2A_HTTP_TIMEOUT, A2A_HTTP_MAX_CONNECTIONS, A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    A2A_HTTP_KEEPALIVE_EXPIRY, A2A_HTTP2, A2A_CALLBACK_URL, A2A_LONG_POLL_WAIT,
+    A2A_CIRCUIT_FAILURE_THRESHOLD, A2A_CIRCUIT_RECOVERY_TIMEOUT, A2A_HTTP_MIN_TIMEOUT,
+    AGENT_CARD_CACHE_PATH, AGENT_CARD_CACHE_TTL, A2A_HEDGE_READS,
+    A2A_MAX_TASKS, A2A_FINISHED_TASK_TTL, A2A_IDLE_TASK_TTL, A2A_TASK_SWEEP_INTERVAL, A2A_TASK_STORE_PATH,
+    A2A_MAX_WORKERS, A2A_MAX_QUEUE_SIZE, A2A_IDEMPOTENCY_MAX_KEYS, A2A_IDEMPOTENCY_TTL,
+    A2A_HTTP_RETRIES, A2A_HTTP_RETRY_BACKOFF, A2A_ARTIFACT_DIR, A2A_MAX_ARTIFACT_SIZE,
+)
 
 
 class CustomerSupportAgent:
     """A2A 프로토콜을 사용하는 고객 지원 에이전트"""
 
-    def __init__(self):
+    def __init__(self, sharding: Optional[TaskSharding] = None):
         self.logger = logging.getLogger(__name__)
 
         # Agent Card 생성
         self.agent_card = create_agent_card()
 
         # A2A 서버 및 클라이언트 초기화
-        self.server = A2AServer(self.agent_card)
-        self.client = A2AClient(self.agent_card.id)
+        self.server = A2AServer(
+            self.agent_card,
+            task_store=create_task_store(
+                A2A_TASK_STORE_PATH,
+                namespace=self.agent_card.id,
+                max_tasks=A2A_MAX_TASKS,
+                finished_ttl=A2A_FINISHED_TASK_TTL,
+                idle_ttl=A2A_IDLE_TASK_TTL,
+            ),
+            task_sweep_interval=A2A_TASK_SWEEP_INTERVAL,
+            max_workers=A2A_MAX_WORKERS,
+            max_queue_size=A2A_MAX_QUEUE_SIZE,
+            idempotency_max_keys=A2A_IDEMPOTENCY_MAX_KEYS,
+            idempotency_ttl=A2A_IDEMPOTENCY_TTL,
+            artifact_dir=A2A_ARTIFACT_DIR,
+            max_artifact_size=A2A_MAX_ARTIFACT_SIZE,
+            sharding=sharding,
+        )
+        self.client = A2AClient(
+            self.agent_card.id,
+            timeout=A2A_HTTP_TIMEOUT,
+            max_connections=A2A_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=A2A_HTTP_KEEPALIVE_EXPIRY,
+            http2=A2A_HTTP2,
+            long_poll_wait=A2A_LONG_POLL_WAIT,
+            failure_threshold=A2A_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=A2A_CIRCUIT_RECOVERY_TIMEOUT,
+            min_timeout=A2A_HTTP_MIN_TIMEOUT,
+            card_cache=AgentCardCache(AGENT_CARD_CACHE_PATH, AGENT_CARD_CACHE_TTL) if AGENT_CARD_CACHE_PATH else None,
+            hedge_reads=A2A_HEDGE_READS,
+            max_retries=A2A_HTTP_RETRIES,
+            retry_backoff=A2A_HTTP_RETRY_BACKOFF,
+        )
 
-        # 외부 에이전트 URLs
+        # 외부 에이전트 복제본 URLs
         self.external_agents = {
-            "product": PRODUCT_AGENT_URL,
-            "shipping": SHIPPING_AGENT_URL,
-            "billing": BILLING_AGENT_URL
+            "product": PRODUCT_AGENT_URLS,
+            "shipping": SHIPPING_AGENT_URLS,
+            "billing": BILLING_AGENT_URLS
         }
 
+        # 백그라운드 에이전트 카드 갱신 작업
+        self._discovery_task: Optional[asyncio.Task] = None
+
+        # 워커 풀에서 처리 중인 스트리밍 응답의 완료 Future (구독자가 연결을 끊어도 끝까지 처리)
+        self._background_tasks: Set[asyncio.Future] = set()
+
         # 서버 핸들러 확장
         self._extend_server_handlers()
 
@@ -48,27 +103,140 @@ class CustomerSupportAgent:
             # 원래 핸들러 호출
             await original_handle_new_task(task)
 
-            # 작업 자동 처리 시작
-            asyncio.create_task(self.process_task(task))
+            # 워커 풀에서 작업 처리 (대기열이 가득 차면 429 응답)
+            self.server.submit_task(self.process_task, task)
+
+        # 위임한 작업의 콜백 수신 시 대기 중인 위임 처리 깨우기
+        async def extended_handle_task_callback(task: Task) -> bool:
+            if not self.client.resolve_callback(task):
+                self.logger.info(f"대기 중이 아닌 작업의 콜백 무시: {task.id}")
+                return False
+            return True
 
         # 핸들러 교체
         self.server.handle_new_task = extended_handle_new_task
+        self.server.handle_task_callback = extended_handle_task_callback
 
     async def startup(self):
-        """에이전트 시작 및 외부 에이전트 검색"""
-        for agent_type, agent_url in self.external_agents.items():
+        """에이전트 시작 및 외부 에이전트 검색
+
+        캐시된 에이전트 카드가 있으면 즉시 등록하고 백그라운드에서 갱신하며,
+        캐시가 없는 에이전트만 기다려서 (동시에) 검색한다.
+        """
+        # 오래된 작업을 주기적으로 정리
+        self.server.start()
+
+        # 로컬 질문 분류기 준비 (학습이 이벤트 루프를 막지 않도록 스레드에서 실행)
+        await asyncio.to_thread(load_query_classifier)
+
+        cached_types = []
+        for agent_type, agent_urls in self.external_agents.items():
+            for agent_url in agent_urls:
+                agent_card = self.client.load_cached_agent(agent_url)
+                if agent_card:
+                    self.logger.info(f"{agent_type} 에이전트 캐시 사용: {agent_card.name} ({agent_url})")
+                    self.client.registered_agents[agent_type] = agent_card
+            if agent_type in self.client.registered_agents:
+                cached_types.append(agent_type)
+
+        uncached_types = [agent_type for agent_type in self.external_agents if agent_type not in cached_types]
+        if uncached_types:
+            await self.discover_agents(uncached_types)
+
+        if cached_types:
+            self._discovery_task = asyncio.create_task(self.discover_agents(cached_types))
+
+    async def discover_agents(self, agent_types: List[str]):
+        """여러 외부 에이전트의 모든 복제본을 동시에 검색하여 등록"""
+
+        async def discover(agent_type: str, agent_url: str):
             try:
                 agent_card = await self.client.discover_agent(agent_url)
-                self.logger.info(f"{agent_type} 에이전트 발견: {agent_card.name}")
+                self.logger.info(f"{agent_type} 에이전트 발견: {agent_card.name} ({agent_url})")
                 # 발견된 에이전트를 타입으로 직접 저장 (ID가 아닌 agent_type을 키로 사용)
                 self.client.registered_agents[agent_type] = agent_card
             except Exception as e:
                 traceback.print_exc()
-                self.logger.info(f"{agent_type} 에이전트는 현재 사용할 수 없습니다: {str(e)}")
+                self.logger.info(f"{agent_type} 에이전트는 현재 사용할 수 없습니다: {agent_url} - {str(e)}")
+
+        await asyncio.gather(*(
+            discover(agent_type, agent_url)
+            for agent_type in agent_types
+            for agent_url in self.external_agents[agent_type]
+        ))
+
+    async def shutdown(self):
+        """에이전트 종료 및 공유 연결 정리"""
+        if self._discovery_task and not self._discovery_task.done():
+            self._discovery_task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.client.aclose()
+        await self.server.aclose()
+        await close_llm_client()
 
     async def process_task(self, task: Task):
         """작업 처리 로직"""
+        try:
+            async for _ in self.process_task_stream(task):
+                pass
+        except LLMStreamInterruptedError as e:
+            # 받은 부분까지의 답변은 이미 응답 메시지로 추가됨
+            self.logger.warning(f"답변 생성 중단: {task.id} - {str(e)}")
+
+    def stream_task(
+        self, task: Task, on_complete: Optional[Callable[[Task], Awaitable[None]]] = None
+    ) -> AsyncIterator[str]:
+        """작업을 워커 풀에서 처리하며 응답 토큰을 생성되는 대로 전달
+
+        새 작업과 같은 우선순위와 대기열 한도를 적용하며, 대기열이 가득 차면 바로 429를 발생시킨다.
+        구독자가 중간에 연결을 끊어도 처리와 on_complete는 끝까지 실행된다.
+        """
+        tokens: asyncio.Queue = asyncio.Queue()
+        finished = asyncio.get_running_loop().create_future()
+
+        async def run(task: Task):
+            try:
+                async for token in self.process_task_stream(task):
+                    tokens.put_nowait(token)
+            except Exception as e:
+                # 오류는 구독자에게 전달하고, 그때까지 추가된 응답은 on_complete에서 저장
+                tokens.put_nowait(e)
+                raise
+            finally:
+                try:
+                    if on_complete is not None:
+                        await on_complete(task)
+                finally:
+                    tokens.put_nowait(None)
+                    finished.set_result(None)
+
+        def shed(task: Task):
+            # 우선순위가 더 높은 작업에 밀려 처리하지 못함
+            tokens.put_nowait(Exception("작업 대기열이 가득 차 처리하지 못했습니다. 잠시 후 다시 시도해주세요"))
+            tokens.put_nowait(None)
+            finished.set_result(None)
+
+        # 같은 작업의 다른 요청과 겹치지 않도록 작업 잠금을 잡고 처리
+        self.server.submit_task(run, task, on_shed=shed)
+        self._background_tasks.add(finished)
+        finished.add_done_callback(self._background_tasks.discard)
+
+        async def receive() -> AsyncIterator[str]:
+            while True:
+                token = await tokens.get()
+                if token is None:
+                    break
+                if isinstance(token, Exception):
+                    raise token
+                yield token
+
+        return receive()
+
+    async def process_task_stream(self, task: Task) -> AsyncIterator[str]:
+        """작업 처리 로직 (LLM 답변은 토큰 단위로, 그 외 응답은 메시지 단위로 전달)"""
         self.logger.info(f"작업 처리 시작: {task.id}")
+        message_count = len(task.messages)
 
         # 초기 상태 업데이트
         task.status = TaskStatus.IN_PROGRESS
@@ -81,13 +249,14 @@ class CustomerSupportAgent:
                 content="안녕하세요! 고객 지원 에이전트입니다. 어떻게 도와드릴까요?"
             )
             task.messages.append(greeting_message)
+            yield greeting_message.content
             return
 
-        # 마지막 메시지 가져오기
-        latest_message = task.messages[-1]
+        # 마지막 텍스트 메시지 가져오기 (첨부 파일 메시지 제외)
+        latest_message = task.latest_text_message()
 
         # 메시지가 클라이언트로부터 온 것인지 확인
-        if latest_message.id.startswith("msg_"):
+        if latest_message is not None and latest_message.id.startswith("msg_"):
             query = latest_message.content
 
             # 카테고리 분류
@@ -98,11 +267,13 @@ class CustomerSupportAgent:
             if category == "general":
                 # 내부 지식 베이스 검색
                 answer = get_faq_answer(query)
-                if not answer:
+                if answer:
+                    await self.send_response(task, answer)
+                else:
                     # LLM을 사용하여 응답 생성
-                    answer = await generate_response(query)
-
-                await self.send_response(task, answer)
+                    async for token in self._stream_llm_response(task, query):
+                        yield token
+                    return
 
             elif category == "product":
                 # 제품 정보 검색 시도
@@ -133,8 +304,27 @@ class CustomerSupportAgent:
 
             else:  # "other"
                 # LLM을 사용하여 일반 응답 생성
-                answer = await generate_response(query)
-                await self.send_response(task, answer)
+                async for token in self._stream_llm_response(task, query):
+                    yield token
+                return
+
+            # 위임/지식 베이스 응답은 완성된 메시지 단위로 전달
+            for message in task.messages[message_count:]:
+                if isinstance(message.content, str):
+                    yield message.content
+
+    async def _stream_llm_response(self, task: Task, query: str) -> AsyncIterator[str]:
+        """LLM 답변을 토큰 단위로 전달하고 완성되면 작업에 응답 메시지로 추가"""
+        tokens = []
+        try:
+            async for token in stream_response(query):
+                tokens.append(token)
+                yield token
+        except LLMStreamInterruptedError:
+            # 중간에 끊긴 답변은 받은 부분까지만 응답으로 남기고 오류는 호출한 쪽에 알림
+            await self.send_response(task, "".join(tokens))
+            raise
+        await self.send_response(task, "".join(tokens))
 
     async def send_response(self, task: Task, content: str):
         """작업에 응답 메시지 추가"""
@@ -146,14 +336,83 @@ class CustomerSupportAgent:
         task.messages.append(response_message)
         task.updated_at = response_message.created_at
 
+        # 작업 구독자 및 콜백에 응답 전달
+        await self.server.publish_task_update(task)
+
+    async def _respond_without_agent(self, task: Task, query: str, agent_name: str):
+        """전문 에이전트를 사용할 수 없을 때 LLM으로 직접 응답 생성"""
+        self.logger.warning(f"{agent_name} 회로가 열려 있어 직접 응답을 생성합니다: {task.id}")
+        answer = await generate_response(query)
+        await self.send_response(task, answer)
+
+    async def _await_delegated_response(self, agent_name: str, agent_id: str, delegated_task_id: str) -> Optional[str]:
+        """위임한 작업의 응답 대기 (콜백 우선, 콜백이 없으면 long-poll 상태 조회로 확인)"""
+        timeout = 20  # 최대 대기 시간
+        wait_time = 2  # 콜백 대기 및 long-poll 미지원 시 조회 간격
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        use_callback = self.client.has_pending_callback(delegated_task_id)
+        attempt = 0
+
+        try:
+            while loop.time() < deadline:
+                attempt += 1
+
+                # 콜백이 도착하면 즉시 반환되고, 도착하지 않으면 상태를 직접 조회
+                task_status = None
+                if use_callback:
+                    task_status = await self.client.wait_for_callback(
+                        delegated_task_id, timeout=min(wait_time, max(deadline - loop.time(), 0))
+                    )
+
+                if task_status is None:
+                    self.logger.info(f"{agent_name} 응답 확인 {attempt} 시도")
+                    try:
+                        # 두 번째 조회부터는 작업이 변경될 때까지 서버에서 대기 (long-poll)
+                        task_status = await self.client.get_task_status(
+                            agent_id, delegated_task_id, wait=max(deadline - loop.time(), 0)
+                        )
+                    except CircuitOpenError:
+                        raise
+                    except Exception as e:
+                        self.logger.error(f"작업 상태 확인 시도 {attempt} 실패: {str(e)}")
+                        task_status = None
+
+                if task_status is not None:
+                    # 작업 상태 로깅
+                    self.logger.info(f"{agent_name} 작업 상태: {task_status.status}, 메시지 수: {len(task_status.messages) if task_status.messages else 0}")
+
+                    # 과부하 등으로 실패한 작업은 더 기다리지 않음
+                    if task_status.status == TaskStatus.FAILED and not task_status.messages:
+                        self.logger.info(f"{agent_name} 작업 실패: {task_status.metadata.get('failure_reason', 'unknown')}")
+                        return None
+
+                    # 작업에 메시지가 있는 경우 응답 추출
+                    if task_status.messages:
+                        for message in task_status.messages:
+                            if message.type == MessageType.TEXT and isinstance(message.content, str) and message.content:
+                                self.logger.info(f"{agent_name} 응답: {message.content[:30]}...")
+                                return message.content
+
+                        # 메시지가 있지만 내용이 없는 경우
+                        if task_status.status == TaskStatus.COMPLETED:
+                            return f"{agent_name}가 응답을 완료했지만 메시지 내용이 없습니다."
+
+                # 콜백도 long-poll도 사용할 수 없으면 잠시 대기 후 재조회
+                if not use_callback and self.client.get_task_version(delegated_task_id) is None:
+                    await asyncio.sleep(min(wait_time, max(deadline - loop.time(), 0)))
+
+            return None
+        finally:
+            self.client.forget_task(delegated_task_id)
+
     async def delegate_to_product_agent(self, task: Task, query: str):
         """제품 에이전트에 작업 위임"""
         try:
-            agent_url = self.external_agents["product"]
-
             # 에이전트 검색이 아직 안 되었으면 검색 시도
             if "product" not in self.client.registered_agents:
-                await self.client.discover_agent(agent_url)
+                await self.discover_agents(["product"])
 
             try:
                 agent_id = self.client.registered_agents["product"].id
@@ -163,12 +422,18 @@ class CustomerSupportAgent:
                 await self.send_response(task, "죄송합니다. 제품 정보 서비스에 일시적인 문제가 발생했습니다. 나중에 다시 시도해주세요.")
                 return
 
+            # 회로가 열려 있으면 에이전트를 기다리지 않고 직접 응답 생성
+            if not self.client.is_available(agent_id):
+                await self._respond_without_agent(task, query, "제품 에이전트")
+                return
+
             # 새 작업 생성
             delegated_task = await self.client.create_task(
                 agent_id=agent_id,
                 title="제품 정보 요청",
                 description=f"고객 질문: {query}",
-                metadata={"original_task_id": task.id}
+                metadata={"original_task_id": task.id, **priority_metadata(task.metadata)},
+                callback_url=A2A_CALLBACK_URL or None
             )
 
             # 작업 위임 메시지 추가
@@ -176,47 +441,21 @@ class CustomerSupportAgent:
 
             # 제품 에이전트로부터 실제 응답 받기
             try:
-                # 제품 에이전트 작업 상태 확인 및 응답 받기
-                max_retries = 10  # 최대 재시도 횟수 증가
-                wait_time = 2  # 대기 시간 증가
-                
-                for attempt in range(max_retries):
-                    self.logger.info(f"제품 에이전트 응답 확인 {attempt+1}/{max_retries} 시도")
-                    
-                    try:
-                        # 작업 상태 확인
-                        task_status = await self.client.get_task_status(agent_id, delegated_task.id)
-                        
-                        # 작업 상태 로깅
-                        self.logger.info(f"제품 에이전트 작업 상태: {task_status.status}, 메시지 수: {len(task_status.messages) if task_status.messages else 0}")
-                        
-                        # 작업에 메시지가 있는 경우 응답 추출
-                        if task_status.messages and len(task_status.messages) > 0:
-                            self.logger.info(f"제품 에이전트 메시지 찾음: {len(task_status.messages)}개")
-                            # 에이전트 응답 메시지 가져오기
-                            for message in task_status.messages:
-                                if message.content:
-                                    self.logger.info(f"제품 에이전트 응답: {message.content[:30]}...")
-                                    await self.send_response(task, message.content)
-                                    return
-                            
-                            # 메시지가 있지만 내용이 없는 경우
-                            if task_status.status == TaskStatus.COMPLETED:
-                                await self.send_response(task, "제품 에이전트가 응답을 완료했지만 메시지 내용이 없습니다.")
-                                return
-                    except Exception as e:
-                        self.logger.error(f"작업 상태 확인 시도 {attempt+1} 실패: {str(e)}")
-                    
-                    # 응답을 기다리는 동안 잠시 대기
-                    await asyncio.sleep(wait_time)
-                
-                # 최대 재시도 횟수를 초과한 경우
-                await self.send_response(task, "제품 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+                response = await self._await_delegated_response("제품 에이전트", agent_id, delegated_task.id)
+                if response:
+                    await self.send_response(task, response)
+                else:
+                    # 최대 재시도 횟수를 초과한 경우
+                    await self.send_response(task, "제품 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+            except CircuitOpenError:
+                await self._respond_without_agent(task, query, "제품 에이전트")
             except Exception as e:
                 traceback.print_exc()
                 self.logger.error(f"제품 에이전트 응답 처리 중 오류: {str(e)}")
                 await self.send_response(task, "제품 정보를 처리하는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
+        except CircuitOpenError:
+            await self._respond_without_agent(task, query, "제품 에이전트")
         except Exception as e:
             traceback.print_exc()
             error_msg = f"제품 정보 요청 중 오류 발생: {str(e)}"
@@ -226,11 +465,9 @@ class CustomerSupportAgent:
     async def delegate_to_shipping_agent(self, task: Task, query: str):
         """배송 에이전트에 작업 위임"""
         try:
-            agent_url = self.external_agents["shipping"]
-
             # 에이전트 검색이 아직 안 되었으면 검색 시도
             if "shipping" not in self.client.registered_agents:
-                await self.client.discover_agent(agent_url)
+                await self.discover_agents(["shipping"])
 
             try:
                 agent_id = self.client.registered_agents["shipping"].id
@@ -240,12 +477,18 @@ class CustomerSupportAgent:
                 await self.send_response(task, "죄송합니다. 배송 서비스에 일시적인 문제가 발생했습니다. 나중에 다시 시도해주세요.")
                 return
 
+            # 회로가 열려 있으면 에이전트를 기다리지 않고 직접 응답 생성
+            if not self.client.is_available(agent_id):
+                await self._respond_without_agent(task, query, "배송 에이전트")
+                return
+
             # 새 작업 생성
             delegated_task = await self.client.create_task(
                 agent_id=agent_id,
                 title="배송 정보 요청",
                 description=f"고객 질문: {query}",
-                metadata={"original_task_id": task.id}
+                metadata={"original_task_id": task.id, **priority_metadata(task.metadata)},
+                callback_url=A2A_CALLBACK_URL or None
             )
 
             # 작업 위임 메시지 추가
@@ -253,47 +496,21 @@ class CustomerSupportAgent:
 
             # 배송 에이전트로부터 실제 응답 받기
             try:
-                # 배송 에이전트 작업 상태 확인 및 응답 받기
-                max_retries = 10  # 최대 재시도 횟수 증가
-                wait_time = 2  # 대기 시간 증가
-                
-                for attempt in range(max_retries):
-                    self.logger.info(f"배송 에이전트 응답 확인 {attempt+1}/{max_retries} 시도")
-                    
-                    try:
-                        # 작업 상태 확인
-                        task_status = await self.client.get_task_status(agent_id, delegated_task.id)
-                        
-                        # 작업 상태 로깅
-                        self.logger.info(f"배송 에이전트 작업 상태: {task_status.status}, 메시지 수: {len(task_status.messages) if task_status.messages else 0}")
-                        
-                        # 작업에 메시지가 있는 경우 응답 추출
-                        if task_status.messages and len(task_status.messages) > 0:
-                            self.logger.info(f"배송 에이전트 메시지 찾음: {len(task_status.messages)}개")
-                            # 에이전트 응답 메시지 가져오기
-                            for message in task_status.messages:
-                                if message.content:
-                                    self.logger.info(f"배송 에이전트 응답: {message.content[:30]}...")
-                                    await self.send_response(task, message.content)
-                                    return
-                            
-                            # 메시지가 있지만 내용이 없는 경우
-                            if task_status.status == TaskStatus.COMPLETED:
-                                await self.send_response(task, "배송 에이전트가 응답을 완료했지만 메시지 내용이 없습니다.")
-                                return
-                    except Exception as e:
-                        self.logger.error(f"작업 상태 확인 시도 {attempt+1} 실패: {str(e)}")
-                    
-                    # 응답을 기다리는 동안 잠시 대기
-                    await asyncio.sleep(wait_time)
-                
-                # 최대 재시도 횟수를 초과한 경우
-                await self.send_response(task, "배송 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+                response = await self._await_delegated_response("배송 에이전트", agent_id, delegated_task.id)
+                if response:
+                    await self.send_response(task, response)
+                else:
+                    # 최대 재시도 횟수를 초과한 경우
+                    await self.send_response(task, "배송 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+            except CircuitOpenError:
+                await self._respond_without_agent(task, query, "배송 에이전트")
             except Exception as e:
                 traceback.print_exc()
                 self.logger.error(f"배송 에이전트 응답 처리 중 오류: {str(e)}")
                 await self.send_response(task, "배송 정보를 처리하는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
+        except CircuitOpenError:
+            await self._respond_without_agent(task, query, "배송 에이전트")
         except Exception as e:
             traceback.print_exc()
             error_msg = f"배송 정보 요청 중 오류 발생: {str(e)}"
@@ -303,11 +520,9 @@ class CustomerSupportAgent:
     async def delegate_to_billing_agent(self, task: Task, query: str):
         """결제 에이전트에 작업 위임"""
         try:
-            agent_url = self.external_agents["billing"]
-
             # 에이전트 검색이 아직 안 되었으면 검색 시도
             if "billing" not in self.client.registered_agents:
-                await self.client.discover_agent(agent_url)
+                await self.discover_agents(["billing"])
 
             try:
                 agent_id = self.client.registered_agents["billing"].id
@@ -317,12 +532,18 @@ class CustomerSupportAgent:
                 await self.send_response(task, "죄송합니다. 결제 정보 서비스에 일시적인 문제가 발생했습니다. 나중에 다시 시도해주세요.")
                 return
 
+            # 회로가 열려 있으면 에이전트를 기다리지 않고 직접 응답 생성
+            if not self.client.is_available(agent_id):
+                await self._respond_without_agent(task, query, "청구 에이전트")
+                return
+
             # 새 작업 생성
             delegated_task = await self.client.create_task(
                 agent_id=agent_id,
                 title="결제 정보 요청",
                 description=f"고객 질문: {query}",
-                metadata={"original_task_id": task.id}
+                metadata={"original_task_id": task.id, **priority_metadata(task.metadata)},
+                callback_url=A2A_CALLBACK_URL or None
             )
 
             # 작업 위임 메시지 추가
@@ -330,47 +551,21 @@ class CustomerSupportAgent:
 
             # 청구 에이전트로부터 실제 응답 받기
             try:
-                # 청구 에이전트 작업 상태 확인 및 응답 받기
-                max_retries = 10  # 최대 재시도 횟수 증가
-                wait_time = 2  # 대기 시간 증가
-                
-                for attempt in range(max_retries):
-                    self.logger.info(f"청구 에이전트 응답 확인 {attempt+1}/{max_retries} 시도")
-                    
-                    try:
-                        # 작업 상태 확인
-                        task_status = await self.client.get_task_status(agent_id, delegated_task.id)
-                        
-                        # 작업 상태 로깅
-                        self.logger.info(f"청구 에이전트 작업 상태: {task_status.status}, 메시지 수: {len(task_status.messages) if task_status.messages else 0}")
-                        
-                        # 작업에 메시지가 있는 경우 응답 추출
-                        if task_status.messages and len(task_status.messages) > 0:
-                            self.logger.info(f"청구 에이전트 메시지 찾음: {len(task_status.messages)}개")
-                            # 에이전트 응답 메시지 가져오기
-                            for message in task_status.messages:
-                                if message.content:
-                                    self.logger.info(f"청구 에이전트 응답: {message.content[:30]}...")
-                                    await self.send_response(task, message.content)
-                                    return
-                            
-                            # 메시지가 있지만 내용이 없는 경우
-                            if task_status.status == TaskStatus.COMPLETED:
-                                await self.send_response(task, "청구 에이전트가 응답을 완료했지만 메시지 내용이 없습니다.")
-                                return
-                    except Exception as e:
-                        self.logger.error(f"작업 상태 확인 시도 {attempt+1} 실패: {str(e)}")
-                    
-                    # 응답을 기다리는 동안 잠시 대기
-                    await asyncio.sleep(wait_time)
-                
-                # 최대 재시도 횟수를 초과한 경우
-                await self.send_response(task, "청구 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+                response = await self._await_delegated_response("청구 에이전트", agent_id, delegated_task.id)
+                if response:
+                    await self.send_response(task, response)
+                else:
+                    # 최대 재시도 횟수를 초과한 경우
+                    await self.send_response(task, "청구 에이전트로부터 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요.")
+            except CircuitOpenError:
+                await self._respond_without_agent(task, query, "청구 에이전트")
             except Exception as e:
                 traceback.print_exc()
                 self.logger.error(f"청구 에이전트 응답 처리 중 오류: {str(e)}")
                 await self.send_response(task, "결제 정보를 처리하는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
+        except CircuitOpenError:
+            await self._respond_without_agent(task, query, "청구 에이전트")
         except Exception as e:
             traceback.print_exc()
             error_msg = f"결제 정보 요청 중 오류 발생: {str(e)}"
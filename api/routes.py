@@ -1,11 +1,15 @@
+import json
+import traceback
 import uuid
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, AsyncIterator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from a2a_protocol.models import Task, Message, MessageType
 from agent.customer_support_agent import CustomerSupportAgent
+from utils.llm_utils import get_llm_stats
 
 
 class QueryRequest(BaseModel):
@@ -23,12 +27,66 @@ _customer_support_agent = None
 
 
 @router.post("/query", response_model=QueryResponse)
-async def handle_query(request: QueryRequest):
-    """고객 질문 처리 API 엔드포인트"""
+async def handle_query(request: QueryRequest, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """고객 질문 처리 API 엔드포인트 (같은 Idempotency-Key의 재시도에는 처음 응답 반환)"""
     global _customer_support_agent
 
-    # 새 작업 ID 생성
-    task_id = f"task_{uuid.uuid4().hex[:10]}"
+    return await _customer_support_agent.server.run_idempotent(
+        idempotency_key, "api/query", request.model_dump(), lambda: _process_query(request)
+    )
+
+
+@router.post("/query/stream")
+async def handle_query_stream(request: QueryRequest):
+    """고객 질문 처리 스트리밍 API 엔드포인트 (답변 토큰을 생성되는 대로 SSE로 전송)"""
+    global _customer_support_agent
+
+    server = _customer_support_agent.server
+    task = _new_query_task(request)
+
+    # 처리 중 변경 사항이 저장소에 반영되도록 먼저 저장한 뒤 워커 풀에 등록 (대기열이 가득 차면 작업을 지우고 429 응답)
+    await server.tasks.asave(task)
+    try:
+        tokens = _customer_support_agent.stream_task(task)
+    except HTTPException:
+        await server.tasks.adelete(task.id)
+        raise
+
+    return StreamingResponse(
+        stream_task_events(task, tokens),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """SSE 이벤트 문자열 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_task_events(task: Task, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """CustomerSupportAgent.stream_task의 응답 토큰을 SSE 이벤트로 전달 (task, token..., done 또는 error 순서)
+
+    답변 도중 오류가 나면 이미 보낸 토큰은 그대로 두고 error 이벤트로 알린다.
+    """
+    yield format_sse("task", {"task_id": task.id})
+
+    try:
+        async for token in tokens:
+            yield format_sse("token", {"text": token})
+    except Exception as e:
+        traceback.print_exc()
+        yield format_sse("error", {"task_id": task.id, "detail": str(e)})
+        return
+
+    response = task.messages[-1].content if len(task.messages) > 1 else ""
+    yield format_sse("done", {"task_id": task.id, "response": response})
+
+
+def _new_query_task(request: QueryRequest) -> Task:
+    """고객 질문 메시지를 담은 새 작업 생성"""
+    # 새 작업 ID 생성 (샤딩 중이면 이 워커가 담당하는 ID)
+    task_id = _customer_support_agent.server.new_task_id()
 
     # 새 작업 생성
     task = Task(
@@ -45,18 +103,25 @@ async def handle_query(request: QueryRequest):
         content=request.query
     )
     task.messages.append(query_message)
+    return task
 
-    # 작업을 A2A 서버에 추가
-    _customer_support_agent.server.tasks[task_id] = task
 
-    # 작업 처리
-    await _customer_support_agent.process_task(task)
+async def _process_query(request: QueryRequest) -> QueryResponse:
+    """새 작업을 만들어 고객 질문 처리"""
+    server = _customer_support_agent.server
+    task = _new_query_task(request)
+    task_id = task.id
 
-    # 응답 메시지 가져오기
-    if len(task.messages) > 1:
-        response_message = task.messages[-1].content
-    else:
-        response_message = "응답을 생성 중입니다..."
+    # 작업을 A2A 서버에 추가하고 처리 (같은 작업의 다른 요청과 겹치지 않도록 잠금)
+    async with server.task_locks.hold(task_id):
+        await server.tasks.asave(task)
+        await _customer_support_agent.process_task(task)
+
+        # 응답 메시지 가져오기
+        if len(task.messages) > 1:
+            response_message = task.messages[-1].content
+        else:
+            response_message = "응답을 생성 중입니다..."
 
     return QueryResponse(
         response=response_message,
@@ -64,26 +129,44 @@ async def handle_query(request: QueryRequest):
     )
 
 
+@router.get("/llm/metrics")
+async def get_llm_metrics():
+    """LLM 호출 통계 API 엔드포인트 (동시 요청 수, 대기/응답 시간)"""
+    return get_llm_stats()
+
+
 @router.get("/tasks/{task_id}", response_model=Task)
 async def get_task(task_id: str):
     """작업 상태 조회 API 엔드포인트"""
     global _customer_support_agent
 
-    if task_id not in _customer_support_agent.server.tasks:
+    task = await _customer_support_agent.server.tasks.aget(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
-    return _customer_support_agent.server.tasks[task_id]
+    return task
 
 
 @router.post("/tasks/{task_id}/messages")
-async def add_message(task_id: str, request: QueryRequest):
-    """기존 작업에 새 메시지 추가 API 엔드포인트"""
+async def add_message(
+    task_id: str,
+    request: QueryRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    """기존 작업에 새 메시지 추가 API 엔드포인트 (같은 Idempotency-Key의 재시도에는 처음 응답 반환)"""
     global _customer_support_agent
 
-    if task_id not in _customer_support_agent.server.tasks:
-        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return await _customer_support_agent.server.run_idempotent(
+        idempotency_key, f"api/tasks/{task_id}/messages", request.model_dump(), lambda: _process_message(task_id, request)
+    )
+
 
-    task = _customer_support_agent.server.tasks[task_id]
+async def _process_message(task_id: str, request: QueryRequest) -> QueryResponse:
+    """기존 작업에 메시지를 추가하여 처리"""
+    server = _customer_support_agent.server
+
+    if not await server.tasks.acontains(task_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
     # 새 메시지 추가
     message = Message(
@@ -91,16 +174,23 @@ async def add_message(task_id: str, request: QueryRequest):
         type=MessageType.TEXT,
         content=request.query
     )
-    task.messages.append(message)
-
-    # 작업 처리
-    await _customer_support_agent.process_task(task)
 
-    # 응답 메시지 가져오기
-    if len(task.messages) > 1:
-        response_message = task.messages[-1].content
-    else:
-        response_message = "응답을 생성 중입니다..."
+    # 같은 작업의 메시지는 도착 순서대로 하나씩 처리 (응답이 다른 메시지를 기준으로 만들어지지 않도록)
+    async with server.task_locks.hold(task_id):
+        # 잠금을 기다리는 동안 작업이 제거되었을 수 있음
+        task = await server.tasks.aget(task_id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+        task.messages.append(message)
+
+        # 작업 처리
+        await _customer_support_agent.process_task(task)
+
+        # 응답 메시지 가져오기
+        if len(task.messages) > 1:
+            response_message = task.messages[-1].content
+        else:
+            response_message = "응답을 생성 중입니다..."
 
     return QueryResponse(
         response=response_message,
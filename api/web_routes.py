@@ -5,15 +5,16 @@ import json
 import traceback
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Request, Depends, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from starlette.status import HTTP_302_FOUND
 
 from a2a_protocol.models import Task, Message, MessageType, TaskStatus
 from agent.customer_support_agent import CustomerSupportAgent
+from api.routes import stream_task_events
 from utils.db import db
 
 # Jinja2 템플릿 설정
@@ -312,14 +313,8 @@ async def chat_interface(
         }
     )
 
-# 채팅 메시지 전송
-@web_router.post("/chat/send")
-async def send_chat_message(
-    request: Request,
-    message: str = Form(...),
-    task_id: Optional[str] = Form(None),
-    support_agent: CustomerSupportAgent = Depends(get_agent)
-):
+def _prepare_chat_task(message: str, task_id: Optional[str], support_agent: CustomerSupportAgent) -> Tuple[Task, int]:
+    """채팅 메시지를 DB에 저장하고 에이전트가 처리할 작업 모델 구성 (작업 모델, 처리 전 메시지 수)"""
     # 작업 정보 가져오기 또는 새 작업 생성
     task_data = None
     if task_id:
@@ -380,22 +375,60 @@ async def send_chat_message(
             created_at=datetime.fromisoformat(msg['created_at'].replace('Z', '+00:00'))
         ))
     
-    # 에이전트 처리 시작
-    await support_agent.process_task(task_model)
-    
-    # 응답 메시지 가져오기 및 DB에 저장
-    if task_model.messages and len(task_model.messages) > len(messages):
-        for new_msg in task_model.messages[len(messages):]:
+    return task_model, len(messages)
+
+def _save_chat_responses(task_model: Task, previous_count: int):
+    """에이전트가 추가한 응답 메시지를 DB에 저장"""
+    if task_model.messages and len(task_model.messages) > previous_count:
+        for new_msg in task_model.messages[previous_count:]:
             response_data = {
                 "id": new_msg.id,
-                "task_id": task_id,
+                "task_id": task_model.id,
                 "type": new_msg.type,
                 "content": new_msg.content
             }
             db.save_message(response_data)
+
+# 채팅 메시지 전송
+@web_router.post("/chat/send")
+async def send_chat_message(
+    request: Request,
+    message: str = Form(...),
+    task_id: Optional[str] = Form(None),
+    support_agent: CustomerSupportAgent = Depends(get_agent)
+):
+    task_model, previous_count = _prepare_chat_task(message, task_id, support_agent)
+    
+    # 에이전트 처리 시작
+    await support_agent.process_task(task_model)
+    
+    # 응답 메시지 가져오기 및 DB에 저장
+    _save_chat_responses(task_model, previous_count)
     
     # 다시 채팅 인터페이스로 리디렉션
-    return RedirectResponse(url=f"/chat?task_id={task_id}", status_code=HTTP_302_FOUND)
+    return RedirectResponse(url=f"/chat?task_id={task_model.id}", status_code=HTTP_302_FOUND)
+
+# 채팅 메시지 스트리밍 전송 (답변 토큰을 생성되는 대로 SSE로 전송)
+@web_router.post("/chat/stream")
+async def stream_chat_message(
+    message: str = Form(...),
+    task_id: Optional[str] = Form(None),
+    support_agent: CustomerSupportAgent = Depends(get_agent)
+):
+    task_model, previous_count = _prepare_chat_task(message, task_id, support_agent)
+    
+    # 답변이 끝나면 응답 메시지를 DB에 저장
+    async def save_responses(task: Task):
+        _save_chat_responses(task, previous_count)
+    
+    # 워커 풀에 등록 (대기열이 가득 차면 429 응답)
+    tokens = support_agent.stream_task(task_model, save_responses)
+    
+    return StreamingResponse(
+        stream_task_events(task_model, tokens),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # 작업 생성 페이지
 @web_router.get("/tasks/create", response_class=HTMLResponse)
@@ -0,0 +1,96 @@
+"""
+로컬 질문 분류기 벤치마크
+학습 데이터를 k개로 나눠 교차 검증하여 정확도, 신뢰도 임계값별 처리 비율(LLM 생략 비율),
+분류 지연 시간을 측정합니다.
+
+실행: python -m benchmarks.classifier_benchmark [--data data/query_examples.tsv] [--folds 5] [--thresholds 0.5 0.6 0.7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.query_classifier import CATEGORIES, QueryClassifier, load_examples  # noqa: E402
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "query_examples.tsv")
+
+
+def split_folds(examples: List[Tuple[str, str]], folds: int, seed: int) -> List[List[Tuple[str, str]]]:
+    """카테고리 비율을 유지하며 k개로 나누기"""
+    by_category: Dict[str, List[Tuple[str, str]]] = {}
+    for example in examples:
+        by_category.setdefault(example[1], []).append(example)
+
+    rng = random.Random(seed)
+    result: List[List[Tuple[str, str]]] = [[] for _ in range(folds)]
+    for items in by_category.values():
+        rng.shuffle(items)
+        for i, example in enumerate(items):
+            result[i % folds].append(example)
+    return result
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def run(data_path: str, folds: int, thresholds: List[float], seed: int):
+    examples = load_examples(data_path)
+    print(f"학습 데이터: {data_path} ({len(examples)}개, {folds}-fold 교차 검증)")
+
+    # (정답, 예측, 신뢰도, 지연 시간)
+    predictions: List[Tuple[str, str, float, float]] = []
+    train_times = []
+    splits = split_folds(examples, folds, seed)
+    for i, test in enumerate(splits):
+        train = [example for j, fold in enumerate(splits) if j != i for example in fold]
+        start = time.perf_counter()
+        classifier = QueryClassifier().train(train, seed=seed)
+        train_times.append(time.perf_counter() - start)
+
+        for query, label in test:
+            start = time.perf_counter()
+            category, confidence = classifier.predict(query)
+            predictions.append((label, category, confidence, time.perf_counter() - start))
+
+    correct = sum(1 for label, category, _, _ in predictions if label == category)
+    latencies = [latency * 1_000_000 for _, _, _, latency in predictions]
+    print(f"전체 정확도: {correct / len(predictions):.1%}")
+    print(f"학습 시간(평균): {sum(train_times) / len(train_times) * 1000:.1f}ms")
+    print(f"분류 지연 시간: p50 {percentile(latencies, 0.5):.1f}us, p99 {percentile(latencies, 0.99):.1f}us")
+
+    print()
+    print(f"{'category':<10} {'count':>6} {'accuracy':>9}")
+    for category in CATEGORIES:
+        items = [(label, predicted) for label, predicted, _, _ in predictions if label == category]
+        if items:
+            accuracy = sum(1 for label, predicted in items if label == predicted) / len(items)
+            print(f"{category:<10} {len(items):>6} {accuracy:>9.1%}")
+
+    # 임계값 이상만 로컬에서 처리하고 나머지는 LLM으로 넘긴다고 가정
+    print()
+    print(f"{'threshold':>9} {'local':>8} {'local_accuracy':>15} {'llm_fallback':>13}")
+    for threshold in thresholds:
+        local = [(label, predicted) for label, predicted, confidence, _ in predictions if confidence >= threshold]
+        coverage = len(local) / len(predictions)
+        accuracy = sum(1 for label, predicted in local if label == predicted) / len(local) if local else 0.0
+        print(f"{threshold:>9.2f} {coverage:>8.1%} {accuracy:>15.1%} {1 - coverage:>13.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 질문 분류기 정확도/지연 시간 리포트")
+    parser.add_argument("--data", default=DEFAULT_DATA_PATH, help="학습 데이터 파일 (카테고리<TAB>질문)")
+    parser.add_argument("--folds", type=int, default=5, help="교차 검증 분할 수")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.5, 0.6, 0.7, 0.8], help="신뢰도 임계값 목록")
+    parser.add_argument("--seed", type=int, default=42, help="데이터 분할/학습 seed")
+    args = parser.parse_args()
+    run(args.data, args.folds, args.thresholds, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+A2A 직렬화 벤치마크
+긴 대화 기록을 가진 Task를 JSON(pydantic)과 msgpack으로 인코딩/디코딩하여
+처리 시간과 페이로드 크기를 비교합니다.
+
+실행: python -m benchmarks.codec_benchmark [--messages 10 100 1000] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from a2a_protocol import codec  # noqa: E402
+from a2a_protocol.models import Task, Message, MessageType, TaskStatus  # noqa: E402
+
+SAMPLE_CONTENT = (
+    "안녕하세요, 주문하신 노트북 Air의 배송 상태를 확인해드리겠습니다. "
+    "현재 물류센터에서 출고 준비 중이며 내일 오전 중 택배사로 인계될 예정입니다. "
+    "추가로 궁금하신 점이 있으시면 언제든지 문의해주세요."
+)
+
+
+def build_task(message_count: int) -> Task:
+    """message_count개의 메시지를 가진 작업 생성"""
+    messages = [
+        Message(id=f"msg_{i:06d}", type=MessageType.TEXT, content=f"{i}. {SAMPLE_CONTENT}")
+        for i in range(message_count)
+    ]
+    return Task(
+        id="task_benchmark",
+        title="고객 문의 처리",
+        description="배송 상태에 대한 장기 대화",
+        status=TaskStatus.IN_PROGRESS,
+        messages=messages,
+        metadata={"customer_id": "CUST001", "tier": "vip"},
+    )
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """함수를 repeat번 실행한 평균 시간(마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def run(message_counts, repeat: int):
+    if not codec.msgpack_available():
+        print("msgpack 패키지가 설치되지 않아 JSON만 측정합니다 (pip install msgpack)")
+
+    media_types = [codec.JSON_MEDIA_TYPE]
+    if codec.msgpack_available():
+        media_types.append(codec.MSGPACK_MEDIA_TYPE)
+
+    print(f"{'messages':>8} {'format':<20} {'size(bytes)':>12} {'encode(us)':>12} {'decode(us)':>12}")
+    for count in message_counts:
+        task = build_task(count)
+        for media_type in media_types:
+            payload = codec.encode(task, media_type)
+            encode_us = measure(lambda: codec.encode(task, media_type), repeat)
+            decode_us = measure(lambda: Task.model_validate(codec.decode(payload, media_type)), repeat)
+            print(f"{count:>8} {media_type:<20} {len(payload):>12,} {encode_us:>12,.1f} {decode_us:>12,.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A2A 직렬화 형식 벤치마크")
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.messages, args.repeat)
@@ -17,11 +17,106 @@ AGENT_DESCRIPTION = os.getenv("AGENT_DESCRIPTION", "고객 질문에 답변하
 # LLM 설정
 LLM_API_KEY = os.getenv("LLM_API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+# LLM 동시 요청 수 제한과 HTTP 연결 풀/타임아웃 설정
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30.0"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# 질문 분류 요청 배치 처리 (linger초 안에 들어온 요청을 최대 배치 크기만큼 모아 한 번에 분류, 1이면 사용 안 함)
+LLM_CLASSIFY_BATCH_SIZE = int(os.getenv("LLM_CLASSIFY_BATCH_SIZE", "16"))
+LLM_CLASSIFY_BATCH_LINGER = float(os.getenv("LLM_CLASSIFY_BATCH_LINGER", "0.005"))
+# 질문 분류 결과 캐시 (정규화한 질문별, 크기가 0이면 사용 안 함, 경로를 지정하면 종료 시 저장하고 시작 시 읽음)
+LLM_CATEGORY_CACHE_SIZE = int(os.getenv("LLM_CATEGORY_CACHE_SIZE", "10000"))
+LLM_CATEGORY_CACHE_TTL = float(os.getenv("LLM_CATEGORY_CACHE_TTL", "86400"))
+LLM_CATEGORY_CACHE_PATH = os.getenv("LLM_CATEGORY_CACHE_PATH", "")
+
+# 로컬 질문 분류기 설정 (신뢰도가 임계값 미만일 때만 LLM으로 분류, 학습 데이터 경로가 비어 있으면 사용 안 함)
+QUERY_CLASSIFIER_DATA_PATH = os.getenv(
+    "QUERY_CLASSIFIER_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "query_examples.tsv")
+)
+# 학습한 모델 저장 경로 (있으면 학습 없이 읽어서 사용)
+QUERY_CLASSIFIER_MODEL_PATH = os.getenv("QUERY_CLASSIFIER_MODEL_PATH", "")
+QUERY_CLASSIFIER_THRESHOLD = float(os.getenv("QUERY_CLASSIFIER_THRESHOLD", "0.6"))
 
 # 외부 에이전트 설정
 PRODUCT_AGENT_URL = os.getenv("PRODUCT_AGENT_URL", "http://localhost:8001/agent")
 SHIPPING_AGENT_URL = os.getenv("SHIPPING_AGENT_URL", "http://localhost:8002/agent")
 BILLING_AGENT_URL = os.getenv("BILLING_AGENT_URL", "http://localhost:8003/agent")
 
+# 외부 에이전트 복제본 URL 목록 (쉼표로 구분, 없으면 단일 URL 사용)
+PRODUCT_AGENT_URLS = [url.strip() for url in os.getenv("PRODUCT_AGENT_URLS", PRODUCT_AGENT_URL).split(",") if url.strip()]
+SHIPPING_AGENT_URLS = [url.strip() for url in os.getenv("SHIPPING_AGENT_URLS", SHIPPING_AGENT_URL).split(",") if url.strip()]
+BILLING_AGENT_URLS = [url.strip() for url in os.getenv("BILLING_AGENT_URLS", BILLING_AGENT_URL).split(",") if url.strip()]
+
+# A2A 클라이언트 HTTP 연결 풀 설정
+A2A_HTTP_TIMEOUT = float(os.getenv("A2A_HTTP_TIMEOUT", "30.0"))
+A2A_HTTP_MAX_CONNECTIONS = int(os.getenv("A2A_HTTP_MAX_CONNECTIONS", "100"))
+A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+A2A_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("A2A_HTTP_KEEPALIVE_EXPIRY", "30.0"))
+A2A_HTTP2 = os.getenv("A2A_HTTP2", "false").lower() == "true"
+
+# 작업 생성/메시지 전송 재시도 횟수와 백오프 (Idempotency-Key로 중복 처리 방지)
+A2A_HTTP_RETRIES = int(os.getenv("A2A_HTTP_RETRIES", "2"))
+A2A_HTTP_RETRY_BACKOFF = float(os.getenv("A2A_HTTP_RETRY_BACKOFF", "0.2"))
+
+# 위임 작업 완료 콜백 수신 URL (빈 값이면 상태 조회만 사용)
+A2A_CALLBACK_URL = os.getenv("A2A_CALLBACK_URL", f"http://localhost:{SERVER_PORT}/api/a2a/callbacks")
+
+# 에이전트별 회로 차단기 및 적응형 타임아웃 설정 (A2A_HTTP_TIMEOUT이 최대 타임아웃)
+A2A_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("A2A_CIRCUIT_FAILURE_THRESHOLD", "5"))
+A2A_CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("A2A_CIRCUIT_RECOVERY_TIMEOUT", "30.0"))
+A2A_HTTP_MIN_TIMEOUT = float(os.getenv("A2A_HTTP_MIN_TIMEOUT", "1.0"))
+
+# 작업 상태 long-poll 최대 대기 시간 (초, 0이면 사용 안 함)
+A2A_LONG_POLL_WAIT = float(os.getenv("A2A_LONG_POLL_WAIT", "10.0"))
+
+# A2A 서버 작업 저장소 상한 (끝난 작업은 TTL이 지나거나 상한을 넘으면 제거)
+A2A_MAX_TASKS = int(os.getenv("A2A_MAX_TASKS", "10000"))
+A2A_FINISHED_TASK_TTL = float(os.getenv("A2A_FINISHED_TASK_TTL", "3600"))
+# 끝나지 않은 작업도 이 시간(초) 동안 변경이 없으면 제거 (0이면 유지)
+A2A_IDLE_TASK_TTL = float(os.getenv("A2A_IDLE_TASK_TTL", "86400"))
+# 작업 저장소 TTL 정리 주기 (초, 요청이 없어도 백그라운드에서 실행)
+A2A_TASK_SWEEP_INTERVAL = float(os.getenv("A2A_TASK_SWEEP_INTERVAL", "60"))
+
+# A2A 서버 작업 저장소 SQLite 파일 (비어 있으면 메모리에만 저장, 같은 파일을 쓰는 복제본끼리 작업 공유)
+A2A_TASK_STORE_PATH = os.getenv("A2A_TASK_STORE_PATH", "")
+
+# A2A 작업 처리 워커 수와 대기열 크기 (대기열이 가득 차면 429 + Retry-After)
+A2A_MAX_WORKERS = int(os.getenv("A2A_MAX_WORKERS", "32"))
+A2A_MAX_QUEUE_SIZE = int(os.getenv("A2A_MAX_QUEUE_SIZE", "1000"))
+
+# 멱등성 키 보관 개수와 기간 (초)
+A2A_IDEMPOTENCY_MAX_KEYS = int(os.getenv("A2A_IDEMPOTENCY_MAX_KEYS", "10000"))
+A2A_IDEMPOTENCY_TTL = float(os.getenv("A2A_IDEMPOTENCY_TTL", "3600"))
+
+# A2A 작업 첨부 파일(아티팩트) 저장 디렉터리와 최대 크기 (디렉터리가 비어 있으면 임시 디렉터리 사용)
+A2A_ARTIFACT_DIR = os.getenv("A2A_ARTIFACT_DIR", "")
+A2A_MAX_ARTIFACT_SIZE = int(os.getenv("A2A_MAX_ARTIFACT_SIZE", str(50 * 1024 * 1024)))
+
+# 응답 압축 최소 크기 (바이트, 이보다 작은 응답은 압축하지 않음)
+A2A_COMPRESSION_MIN_SIZE = int(os.getenv("A2A_COMPRESSION_MIN_SIZE", "1024"))
+
+# 작업 샤딩 설정 (작업 ID를 일관된 해싱으로 워커/노드에 배정하고, 담당이 아닌 요청은 담당 노드로 전달)
+# A2A_SHARD_WORKERS가 2 이상이면 main.py가 워커 프로세스를 띄우고, 각 워커는 A2A_SHARD_BASE_PORT부터 내부 포트를 하나씩 사용
+A2A_SHARD_WORKERS = int(os.getenv("A2A_SHARD_WORKERS", "1"))
+A2A_SHARD_HOST = os.getenv("A2A_SHARD_HOST", "127.0.0.1")
+A2A_SHARD_BASE_PORT = int(os.getenv("A2A_SHARD_BASE_PORT", str(SERVER_PORT + 100)))
+# 여러 서버에 나눠 배포할 때는 전체 노드 URL 목록(쉼표로 구분)과 자신의 URL 지정
+A2A_SHARD_NODES = [url.strip() for url in os.getenv("A2A_SHARD_NODES", "").split(",") if url.strip()]
+A2A_SHARD_SELF = os.getenv("A2A_SHARD_SELF", "")
+# 담당이 아닌 요청 처리 방식 (forward: 담당 노드로 전달, redirect: 307 리다이렉트)
+A2A_SHARD_MODE = os.getenv("A2A_SHARD_MODE", "forward")
+
+# 조회 요청 헤지 (p95 응답 시간 안에 응답이 없으면 다른 복제본에 한 번 더 요청)
+A2A_HEDGE_READS = os.getenv("A2A_HEDGE_READS", "false").lower() == "true"
+
+# 에이전트 카드 캐시 설정 (빈 값이면 캐시 사용 안 함)
+AGENT_CARD_CACHE_PATH = os.getenv(
+    "AGENT_CARD_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "agent_cards_cache.json")
+)
+AGENT_CARD_CACHE_TTL = float(os.getenv("AGENT_CARD_CACHE_TTL", "3600"))
+
 # 로깅 설정
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
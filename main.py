@@ -1,5 +1,7 @@
 import logging
+import multiprocessing
 import os
+import socket
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -7,10 +9,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from a2a_protocol.compression import CompressionMiddleware
+from a2a_protocol.sharding import ShardRouter, create_task_sharding
 from agent.customer_support_agent import CustomerSupportAgent
 from api.routes import init_routes
 from api.web_routes import init_web_routes
-from config import SERVER_HOST, SERVER_PORT, LOG_LEVEL
+from config import (
+    SERVER_HOST, SERVER_PORT, LOG_LEVEL, A2A_COMPRESSION_MIN_SIZE,
+    A2A_SHARD_WORKERS, A2A_SHARD_HOST, A2A_SHARD_BASE_PORT, A2A_SHARD_NODES, A2A_SHARD_SELF, A2A_SHARD_MODE,
+)
 from utils.db import db
 
 # 로깅 설정
@@ -24,6 +31,9 @@ logger = logging.getLogger(__name__)
 # 전역 변수로 에이전트 선언
 agent = None
 
+# 작업 샤딩 설정 (노드가 여러 개이면 작업 ID별 담당 워커/노드에서 처리)
+sharding = create_task_sharding(A2A_SHARD_NODES, A2A_SHARD_SELF, A2A_SHARD_MODE)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 라이프스팸 관리를 위한 비동기 컨텍스트 매니저"""
@@ -36,7 +46,7 @@ async def lifespan(app: FastAPI):
     logger.info("데이터베이스 초기화 중...")
 
     # 고객 지원 에이전트 인스턴스 생성
-    agent = CustomerSupportAgent()
+    agent = CustomerSupportAgent(sharding=sharding)
     
     # API 라우트 초기화
     app.include_router(init_routes(agent), prefix="/api")
@@ -57,7 +67,8 @@ async def lifespan(app: FastAPI):
     yield  # 여기서 FastAPI 애플리케이션 실행
     
     # 종료 시 실행 (shutdown)
-    # 필요한 정리 작업이 있다면 여기에 추가
+    logger.info("A2A 고객 지원 에이전트 종료 중...")
+    await agent.shutdown()
 
 
 app = FastAPI(
@@ -67,6 +78,16 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 담당하지 않는 작업에 대한 요청은 담당 워커/노드로 전달
+if sharding is not None:
+    app.add_middleware(
+        ShardRouter,
+        sharding=sharding,
+        a2a_prefixes=("/api/a2a",),
+        task_prefixes=("/api",),
+        create_paths=("/api/query",),
+    )
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -76,15 +97,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 설정 (큰 작업 JSON과 웹 페이지를 zstd/gzip으로 압축)
+app.add_middleware(CompressionMiddleware, minimum_size=A2A_COMPRESSION_MIN_SIZE)
+
 # 정적 파일 서빙 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+def run_shard_worker(shared_socket: socket.socket, port: int):
+    """샤드 워커 실행 (공용 포트와 자신의 내부 포트를 함께 수신)"""
+    config = uvicorn.Config(app, host=A2A_SHARD_HOST, port=port, log_level=LOG_LEVEL.lower())
+    uvicorn.Server(config).run(sockets=[shared_socket, config.bind_socket()])
+
+
+def run_sharded(workers: int):
+    """작업을 워커 프로세스에 나눠 맡기는 샤딩 모드로 실행
+
+    모든 워커가 SERVER_PORT로 들어오는 요청을 함께 받고, 작업 ID를 담당하지 않는 워커는
+    담당 워커의 내부 포트(A2A_SHARD_BASE_PORT + 워커 번호)로 요청을 전달합니다.
+    위임 작업의 완료 콜백은 작업을 위임한 워커로 돌아오도록 워커별 내부 포트를 사용합니다.
+    """
+    nodes = [f"http://{A2A_SHARD_HOST}:{A2A_SHARD_BASE_PORT + index}" for index in range(workers)]
+
+    shared_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    shared_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    shared_socket.bind((SERVER_HOST, SERVER_PORT))
+    shared_socket.set_inheritable(True)
+
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for index, node in enumerate(nodes):
+        # 워커 프로세스는 시작할 때 환경 변수에서 샤딩 설정을 읽음
+        os.environ.update({
+            "A2A_SHARD_NODES": ",".join(nodes),
+            "A2A_SHARD_SELF": node,
+            "A2A_CALLBACK_URL": f"{node}/api/a2a/callbacks",
+        })
+        process = context.Process(
+            target=run_shard_worker, args=(shared_socket, A2A_SHARD_BASE_PORT + index), name=f"a2a-shard-{index}"
+        )
+        process.start()
+        processes.append(process)
+
+    logger.info(f"A2A 고객 지원 에이전트를 워커 {workers}개로 http://{SERVER_HOST}:{SERVER_PORT}에서 실행합니다")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=SERVER_HOST,
-        port=SERVER_PORT,
-        reload=True,
-        log_level=LOG_LEVEL.lower(),
-    )
\ No newline at end of file
+    if A2A_SHARD_WORKERS > 1:
+        run_sharded(A2A_SHARD_WORKERS)
+    else:
+        uvicorn.run(
+            "main:app",
+            host=SERVER_HOST,
+            port=SERVER_PORT,
+            reload=True,
+            log_level=LOG_LEVEL.lower(),
+        )
\ No newline at end of file
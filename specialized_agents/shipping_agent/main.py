@@ -1,16 +1,13 @@
 import logging
 import os
 from contextlib import asynccontextmanager
-import uuid
-from datetime import datetime, timezone
-import asyncio
-from enum import Enum
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
 
+from a2a_protocol.compression import CompressionMiddleware
+from a2a_protocol.sharding import ShardRouter, create_task_sharding
 from shipping_agent import ShippingAgent
 
 # 로깅 설정
@@ -23,35 +20,10 @@ logging.basicConfig(
 # 전역 변수로 에이전트 선언
 agent = None
 
-# TaskStatus Enum
-class TaskStatus(str, Enum):
-    CREATED = "created"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-
-# MessageType Enum
-class MessageType(str, Enum):
-    TEXT = "text"
-    IMAGE = "image"
-    VIDEO = "video"
-
-# Task 모델
-class Task(BaseModel):
-    id: str
-    title: str
-    description: str
-    status: TaskStatus
-    created_at: datetime
-    updated_at: datetime
-    metadata: dict
-    messages: list = []
-
-# Message 모델
-class Message(BaseModel):
-    id: str
-    type: MessageType
-    content: str
-    created_at: datetime
+# 작업 샤딩 설정 (A2A_SHARD_NODES에 노드가 여러 개이면 작업 ID별 담당 노드에서 처리)
+sharding = create_task_sharding(
+    os.getenv("A2A_SHARD_NODES"), os.getenv("A2A_SHARD_SELF"), os.getenv("A2A_SHARD_MODE", "forward")
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -63,8 +35,11 @@ async def lifespan(app: FastAPI):
     logger.info("배송 정보 에이전트 시작 중...")
     
     # 에이전트 객체 생성
-    agent = ShippingAgent()
+    agent = ShippingAgent(sharding=sharding)
     await agent.startup()
+
+    # A2A 프로토콜 라우트 (/agent/a2a/...) 설정
+    app.include_router(agent.server.router, prefix="/agent")
     
     logger.info("배송 정보 에이전트가 http://localhost:8002에서 실행 중입니다")
     
@@ -72,6 +47,7 @@ async def lifespan(app: FastAPI):
     
     # 종료 시 처리 (필요한 경우)
     logger.info("배송 정보 에이전트를 종료합니다...")
+    await agent.server.aclose()
 
 
 app = FastAPI(
@@ -81,6 +57,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 담당하지 않는 작업에 대한 요청은 담당 노드로 전달
+if sharding is not None:
+    app.add_middleware(ShardRouter, sharding=sharding, a2a_prefixes=("/agent/a2a",))
+
 # CORS 미들웨어 설정
 app.add_middleware(
     CORSMiddleware,
@@ -90,82 +70,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 설정 (큰 작업 JSON을 zstd/gzip으로 압축)
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("A2A_COMPRESSION_MIN_SIZE", "1024")))
+
 # A2A 프로토콜 엔드포인트 설정
 @app.get("/agent/.well-known/agent.json")
-async def agent_card():
-    """에이전트 카드 반환"""
-    return agent.agent_card.dict()
-
-@app.post("/agent/a2a/tasks")
-async def create_task(task_data: dict):
-    """새 작업 생성"""
-    task_id = task_data.get("id", f"task_{uuid.uuid4().hex[:10]}")
-    
-    # 새 작업 생성
-    task = Task(
-        id=task_id,
-        title=task_data.get("title", "새 작업"),
-        description=task_data.get("description", ""),
-        status=TaskStatus.CREATED,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        metadata=task_data.get("metadata", {})
-    )
-    
-    # 작업 저장 및 핸들러 호출
-    agent.server.tasks[task_id] = task
-    
-    # 기존 메시지가 있으면 삭제하지 않도록 유지 (추가)
-    if hasattr(agent.server.tasks[task_id], 'messages') and agent.server.tasks[task_id].messages:
-        # 기존 메시지 유지
-        task.messages = agent.server.tasks[task_id].messages
-    
-    asyncio.create_task(agent.server.handle_new_task(task))
-    
-    return task
-
-@app.get("/agent/a2a/tasks/{task_id}")
-async def get_task(task_id: str):
-    """작업 정보 조회"""
-    if task_id not in agent.server.tasks:
-        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
-    
-    return agent.server.tasks[task_id]
-
-@app.post("/agent/a2a/tasks/{task_id}/messages")
-async def send_message(task_id: str, message_data: dict):
-    """메시지 전송"""
-    if task_id not in agent.server.tasks:
-        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
-    
-    task = agent.server.tasks[task_id]
-    
-    # 새 메시지 생성
-    message_id = message_data.get("id", f"msg_{uuid.uuid4().hex[:10]}")
-    message = Message(
-        id=message_id,
-        type=message_data.get("type", MessageType.TEXT),
-        content=message_data.get("content", ""),
-        created_at=datetime.now(timezone.utc)
-    )
-    
-    # 작업에 메시지 추가
-    task.messages.append(message)
-    task.updated_at = datetime.now(timezone.utc)
-    task.status = TaskStatus.IN_PROGRESS
-    
-    # 메시지 핸들러 호출 전에 작업 상태 확인 및 로깅 (추가)
-    logging.info(f"메시지 추가 후 작업 상태: {task.id}, 메시지 수: {len(task.messages)}")
-    for idx, msg in enumerate(task.messages):
-        logging.info(f"  메시지 {idx}: {msg.id}, 콘텐츠: {msg.content[:30]}...")
-    
-    # 서버 작업 상태 명시적 업데이트 (추가)
-    agent.server.tasks[task_id] = task
-    
-    # 메시지 핸들러 호출
-    asyncio.create_task(agent.server.handle_new_message(task, message))
-    
-    return message
+async def agent_card(request: Request):
+    """에이전트 카드 반환 (ETag 재검증 지원)"""
+    return agent.server.agent_card_response(request)
 
 
 if __name__ == "__main__":
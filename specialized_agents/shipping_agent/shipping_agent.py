@@ -1,22 +1,35 @@
 import asyncio
 import logging
+import os
+from typing import Optional
 
 from a2a_protocol.client import A2AClient
 from a2a_protocol.models import Task, Message, TaskStatus, MessageType, AgentCard
 from a2a_protocol.server import A2AServer
+from a2a_protocol.sharding import TaskSharding
+from a2a_protocol.task_store import create_task_store
 
 
 class ShippingAgent:
     """배송 정보를 제공하는 A2A 호환 에이전트"""
 
-    def __init__(self):
+    def __init__(self, sharding: Optional[TaskSharding] = None):
         self.logger = logging.getLogger(__name__)
 
         # Agent Card 생성
         self.agent_card = self._create_agent_card()
 
         # A2A 서버 및 클라이언트 초기화
-        self.server = A2AServer(self.agent_card)
+        # A2A_TASK_STORE_PATH를 지정하면 SQLite에 작업을 저장하여 재시작 및 복제본 간에 공유
+        self.server = A2AServer(
+            self.agent_card,
+            task_store=create_task_store(os.getenv("A2A_TASK_STORE_PATH"), namespace=self.agent_card.id),
+            max_workers=int(os.getenv("A2A_MAX_WORKERS", "32")),
+            max_queue_size=int(os.getenv("A2A_MAX_QUEUE_SIZE", "1000")),
+            artifact_dir=os.getenv("A2A_ARTIFACT_DIR"),
+            max_artifact_size=int(os.getenv("A2A_MAX_ARTIFACT_SIZE", str(50 * 1024 * 1024))),
+            sharding=sharding,
+        )
         self.client = A2AClient(self.agent_card.id)
 
         # 배송 정책 데이터 (간단한 예시용)
@@ -133,14 +146,16 @@ class ShippingAgent:
             # 원래 핸들러 호출
             await original_handle_new_task(task)
 
-            # 작업 자동 처리 시작
-            asyncio.create_task(self.process_task(task))
+            # 워커 풀에서 작업 처리 (대기열이 가득 차면 429 응답)
+            self.server.submit_task(self.process_task, task)
 
         # 핸들러 교체
         self.server.handle_new_task = extended_handle_new_task
 
     async def startup(self):
         """에이전트 시작"""
+        # 오래된 작업을 주기적으로 정리
+        self.server.start()
         self.logger.info("배송 정보 에이전트 준비 완료")
 
     async def process_task(self, task: Task):
@@ -161,14 +176,14 @@ class ShippingAgent:
             
             # 서버 작업 상태 명시적 업데이트
             self.logger.info(f"인사말 메시지 추가: {greeting_message.id}, 메시지 수: {len(task.messages)}")
-            self.server.tasks[task.id] = task
+            await self.server.publish_task_update(task)
             return
 
-        # 마지막 메시지 가져오기
-        latest_message = task.messages[-1]
+        # 마지막 텍스트 메시지 가져오기 (첨부 파일 메시지 제외)
+        latest_message = task.latest_text_message()
 
         # 메시지가 클라이언트로부터 온 것인지 확인
-        if latest_message.id.startswith("msg_"):
+        if latest_message is not None and latest_message.id.startswith("msg_"):
             query = latest_message.content.lower()
             
             # 배송 추적 처리
@@ -250,4 +265,4 @@ class ShippingAgent:
                 
             # 서버 작업 상태 명시적 업데이트
             self.logger.info(f"응답 메시지 추가: {response_message.id}, 메시지 수: {len(task.messages)}")
-            self.server.tasks[task.id] = task
+            await self.server.publish_task_update(task)
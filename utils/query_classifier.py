@@ -0,0 +1,172 @@
+"""
+로컬 고객 질문 분류기
+문자 n-gram 특징과 다중 클래스 로지스틱 회귀로 질문을 카테고리로 분류합니다.
+분류 신뢰도가 임계값 이상이면 LLM 호출 없이 바로 결과를 사용할 수 있습니다.
+
+학습 데이터 파일 형식: 한 줄에 "카테고리<TAB>질문" (빈 줄과 #으로 시작하는 줄은 무시)
+"""
+import json
+import logging
+import math
+import os
+import random
+import re
+import traceback
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("general", "product", "shipping", "billing", "other")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """분류용 질문 정규화 (소문자, 공백 정리)"""
+    return _WHITESPACE.sub(" ", query.strip().lower())
+
+
+def char_ngrams(query: str, min_n: int = 1, max_n: int = 3) -> Dict[str, float]:
+    """문자 n-gram 특징 추출 (단어 경계를 공백으로 표시, 길이로 정규화한 가중치)"""
+    text = f" {normalize_query(query)} "
+    counts: Dict[str, int] = {}
+    for n in range(min_n, max_n + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram.strip():
+                counts[gram] = counts.get(gram, 0) + 1
+
+    if not counts:
+        return {}
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return {gram: count / norm for gram, count in counts.items()}
+
+
+def load_examples(path: str) -> List[Tuple[str, str]]:
+    """학습 데이터 파일에서 (질문, 카테고리) 목록 읽기"""
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            category, _, query = line.partition("\t")
+            category = category.strip()
+            if category not in CATEGORIES or not query.strip():
+                raise ValueError(f"{path}:{line_number}: 잘못된 학습 데이터입니다: {line}")
+            examples.append((query.strip(), category))
+    return examples
+
+
+class QueryClassifier:
+    """문자 n-gram 기반 선형 질문 분류기 (softmax 로지스틱 회귀)"""
+
+    def __init__(self, categories: Iterable[str] = CATEGORIES, min_n: int = 1, max_n: int = 3):
+        self.categories = list(categories)
+        self.min_n = min_n
+        self.max_n = max_n
+        # n-gram별 카테고리 가중치
+        self.weights: Dict[str, List[float]] = {}
+        self.bias = [0.0] * len(self.categories)
+
+    def _features(self, query: str) -> Dict[str, float]:
+        return char_ngrams(query, self.min_n, self.max_n)
+
+    def _scores(self, features: Dict[str, float]) -> List[float]:
+        scores = list(self.bias)
+        for gram, value in features.items():
+            weights = self.weights.get(gram)
+            if weights is None:
+                continue
+            for i, weight in enumerate(weights):
+                scores[i] += weight * value
+        return scores
+
+    @staticmethod
+    def _softmax(scores: List[float]) -> List[float]:
+        top = max(scores)
+        exps = [math.exp(score - top) for score in scores]
+        total = sum(exps)
+        return [value / total for value in exps]
+
+    def train(
+        self,
+        examples: List[Tuple[str, str]],
+        epochs: int = 30,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        seed: int = 42,
+    ) -> "QueryClassifier":
+        """확률적 경사 하강법으로 학습 (같은 데이터와 seed면 같은 모델)"""
+        index = {category: i for i, category in enumerate(self.categories)}
+        samples = [(self._features(query), index[category]) for query, category in examples]
+        rng = random.Random(seed)
+
+        for epoch in range(epochs):
+            rng.shuffle(samples)
+            rate = learning_rate / (1 + epoch * 0.1)
+            for features, label in samples:
+                probs = self._softmax(self._scores(features))
+                gradients = [prob - (1.0 if i == label else 0.0) for i, prob in enumerate(probs)]
+
+                for gram, value in features.items():
+                    weights = self.weights.setdefault(gram, [0.0] * len(self.categories))
+                    for i, gradient in enumerate(gradients):
+                        weights[i] -= rate * (gradient * value + l2 * weights[i])
+                for i, gradient in enumerate(gradients):
+                    self.bias[i] -= rate * gradient
+
+        return self
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        """질문의 카테고리와 신뢰도(softmax 확률) 반환"""
+        features = self._features(query)
+        if not features or not self.weights:
+            return "general", 0.0
+
+        probs = self._softmax(self._scores(features))
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.categories[best], probs[best]
+
+    def to_dict(self) -> Dict:
+        return {
+            "categories": self.categories,
+            "min_n": self.min_n,
+            "max_n": self.max_n,
+            "bias": self.bias,
+            "weights": self.weights,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QueryClassifier":
+        classifier = cls(data["categories"], data["min_n"], data["max_n"])
+        classifier.bias = data["bias"]
+        classifier.weights = data["weights"]
+        return classifier
+
+    def save(self, path: str):
+        """모델을 JSON 파일로 저장"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "QueryClassifier":
+        """JSON 파일에서 모델 읽기"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def create_query_classifier(data_path: Optional[str], model_path: Optional[str] = None) -> Optional[QueryClassifier]:
+    """저장된 모델을 읽거나 학습 데이터로 분류기 생성 (둘 다 없으면 None)"""
+    try:
+        if model_path and os.path.exists(model_path):
+            return QueryClassifier.load(model_path)
+        if data_path and os.path.exists(data_path):
+            classifier = QueryClassifier().train(load_examples(data_path))
+            if model_path:
+                classifier.save(model_path)
+            return classifier
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"질문 분류기 생성 오류: {str(e)}")
+    return None